@@ -0,0 +1,82 @@
+"""
+Browser mode benchmark: per-refresh latency and resident memory of Chrome in
+each BROWSER_MODES entry (see browser_session.py).
+
+Every mode gets a fresh BrowserSession that loads the URL, reloads it
+--refreshes times and reads the memory of chromedriver plus all Chrome
+processes (needs psutil) after each reload. Point it at the real
+ReportViewer URL, or at a recorded page served by report_stub_server.py.
+
+    python report_stub_server.py recorded/ --port 8765 &
+    python bench_browser.py "http://127.0.0.1:8765/ReportServer?/DHR&rs:Format=HTML4.0"
+    python bench_browser.py URL --modes lean --refreshes 50
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from browser_session import BROWSER_MODES, BrowserSession
+from cycle_metrics import StageMetrics
+
+DEFAULT_REFRESHES = 20
+
+# ================= BENCH =================
+
+def bench_mode(mode, url, refreshes):
+    metrics = StageMetrics()
+    memory = []
+    started = time.perf_counter()
+    session = BrowserSession(None, None, mode=mode)
+    launch_ms = (time.perf_counter() - started) * 1000
+    try:
+        sb = session.sb
+        with metrics.stage("first load"):
+            sb.open(url)
+            sb.wait_for_ready_state_complete()
+        for _ in range(refreshes):
+            with metrics.stage("refresh"):
+                sb.driver.refresh()
+                sb.wait_for_ready_state_complete()
+            memory.append(session.memory_mb())
+    finally:
+        session.quit()
+
+    refresh = metrics.summary()["refresh"] if refreshes else {}
+    samples = [m for m in memory if m is not None]
+    return {
+        "launch_ms": launch_ms,
+        "first_load_ms": metrics.summary()["first load"]["last_ms"],
+        "refresh_p50_ms": refresh.get("p50_ms"),
+        "refresh_p90_ms": refresh.get("p90_ms"),
+        "rss_median_mb": statistics.median(samples) if samples else None,
+        "rss_max_mb": max(samples) if samples else None,
+    }
+
+
+def fmt(value, width):
+    return f"{value:>{width}.0f}" if value is not None else f"{'n/a':>{width}}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare refresh latency and memory of the browser modes.")
+    parser.add_argument("url", help="report page to load and refresh")
+    parser.add_argument("--modes", nargs="+", choices=list(BROWSER_MODES), default=list(BROWSER_MODES))
+    parser.add_argument("--refreshes", type=int, default=DEFAULT_REFRESHES)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in args.modes:
+        print(f"Running {mode} mode ({args.refreshes} refreshes)...")
+        try:
+            results[mode] = bench_mode(mode, args.url, args.refreshes)
+        except Exception as e:
+            print(f"❌ {mode} mode failed: {e}")
+    if not results:
+        sys.exit(1)
+
+    print(f"\n{'mode':<6} {'launch':>8} {'1st load':>9} {'refresh p50':>12} {'p90':>7} {'RSS MB':>8} {'max MB':>8}")
+    for mode, r in results.items():
+        print(f"{mode:<6} {fmt(r['launch_ms'], 6)}ms {fmt(r['first_load_ms'], 7)}ms "
+              f"{fmt(r['refresh_p50_ms'], 10)}ms {fmt(r['refresh_p90_ms'], 5)}ms "
+              f"{fmt(r['rss_median_mb'], 8)} {fmt(r['rss_max_mb'], 8)}")
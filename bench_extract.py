@@ -0,0 +1,39 @@
+"""
+Benchmark for extract() across the report_parser engines.
+
+Builds a ReportViewer-shaped page with synthetic_report.py, checks every
+engine returns exactly the same rows as bs4, and prints the speedup.
+
+    python bench_extract.py            # 1k, 10k and 50k rows
+    python bench_extract.py 200000     # custom sizes
+"""
+import sys
+import time
+
+import report
+from report_parser import available_engines
+from synthetic_report import make_report_html
+
+# ================= BENCH =================
+
+def bench(n_rows, repeat=3):
+    html = make_report_html(n_rows)
+    print(f"\n{n_rows} rows ({len(html) / 1e6:.1f} MB of HTML)")
+    reference = report.extract(html, engine="bs4") if "bs4" in available_engines() else None
+    baseline = None
+    for engine in reversed(available_engines()):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            rows = report.extract(html, engine=engine)
+            best = min(best, time.perf_counter() - t0)
+        same = "n/a" if reference is None else ("OK" if rows == reference else "MISMATCH")
+        baseline = baseline or best
+        print(f"  {engine:<11} {best * 1000:9.1f} ms  x{baseline / best:5.1f}  rows={len(rows)}  same-as-bs4={same}")
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 50000]
+    print(f"Engines: {', '.join(available_engines())}")
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,78 @@
+"""
+Multi-page report retrieval benchmark: time to fetch and parse every page of
+a paginated (HTML4.0) report, sequentially vs concurrently (fetch_pages) vs
+as one non-paginated render, against report_stub_server.py.
+
+The synthetic report is split into pages mid-group (no repeated header or
+rowspan'd cells), and the rows merged from the pages are checked against
+extract() of the same report as one page.
+
+    python bench_pages.py                                  # 20k rows in 1, 2, 4, 8, 16 pages
+    python bench_pages.py --rows 50000 --pages 1 8 32 --delay 0.2 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import reporting_app as app
+from report_http import PAGE_WORKERS, REPORT_PATH, ReportHTTPClient
+from report_stub_server import StubReportServer
+from synthetic_report import make_report_html, make_report_pages
+
+DEFAULT_PAGES = [1, 2, 4, 8, 16]
+
+# ================= BENCH =================
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def bench_pages(client, n_pages, workers, expected):
+    pages = range(1, n_pages + 1)
+    sequential, seq_pages = timed(lambda: client.fetch_pages("C-BENCH", pages, app.page_cells, workers=1))
+    concurrent, con_pages = timed(lambda: client.fetch_pages("C-BENCH", pages, app.page_cells, workers=workers))
+    single, whole = timed(lambda: [app.page_cells(client.fetch("C-BENCH"))])
+    for name, result in (("sequential", seq_pages), ("concurrent", con_pages), ("single render", whole)):
+        if app.rows_from_pages(result) != expected:
+            raise RuntimeError(f"❌ {n_pages} pages, {name}: merged rows differ from the one-page extract()")
+    return {"sequential_ms": sequential, "concurrent_ms": concurrent, "single_ms": single}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare multi-page report retrieval strategies.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--pages", nargs="+", type=int, default=DEFAULT_PAGES)
+    parser.add_argument("--delay", type=float, default=0.1, help="simulated server render time per request (s)")
+    parser.add_argument("--workers", type=int, default=PAGE_WORKERS, help="concurrent page requests")
+    args = parser.parse_args()
+
+    expected = app.extract(make_report_html(args.rows))
+    print(f"{len(expected)} PASS rows, {args.delay * 1000:.0f} ms per request, {args.workers} workers")
+    print(f"{'pages':>6} {'sequential':>11} {'concurrent':>11} {'speedup':>8} {'single render':>14}")
+    with tempfile.TemporaryDirectory() as responses:
+        server = StubReportServer(responses, delay=args.delay).start()
+        client = ReportHTTPClient(server.url, REPORT_PATH, "bench", "bench", "HTML4.0")
+        try:
+            with open(os.path.join(responses, "default.html"), "w", encoding="utf-8") as f:
+                f.write(make_report_html(args.rows))
+            for n_pages in args.pages:
+                for name in os.listdir(responses):
+                    if name.startswith("default.p"):
+                        os.remove(os.path.join(responses, name))
+                for i, html in enumerate(make_report_pages(args.rows, n_pages), 1):
+                    with open(os.path.join(responses, f"default.p{i}.html"), "w", encoding="utf-8") as f:
+                        f.write(html)
+                try:
+                    r = bench_pages(client, n_pages, args.workers, expected)
+                except RuntimeError as e:
+                    print(e)
+                    sys.exit(1)
+                print(f"{n_pages:>6} {r['sequential_ms']:>9.0f}ms {r['concurrent_ms']:>9.0f}ms "
+                      f"{r['sequential_ms'] / r['concurrent_ms']:>7.1f}x {r['single_ms']:>12.0f}ms")
+        finally:
+            client.close()
+            server.stop()
@@ -0,0 +1,116 @@
+"""
+Startup benchmark for the GUI.
+
+Runs fresh interpreters and reports:
+  * per-module import time of reporting_app (python -X importtime), with the
+    heavy third-party packages broken out wherever they are first imported;
+  * wall time from process start to the login window's first paint;
+  * how long the background preload of the scraping stack takes after that.
+
+    python bench_startup.py              # 5 runs, median
+    python bench_startup.py --runs 10 --offscreen
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Reported individually wherever they show up in the import tree
+WATCHED = (
+    "PyQt5.QtWidgets", "PyQt5.QtGui", "PyQt5.QtCore",
+    "seleniumbase", "selenium", "requests", "bs4", "lxml", "selectolax",
+    "report_parser", "report_http", "browser_session", "pipeline", "history_store", "shifts",
+)
+
+FIRST_PAINT_SCRIPT = r"""
+import sys, time
+t0 = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+app = QApplication(sys.argv)
+import reporting_app
+window = reporting_app.MainWindow()
+window.show()
+
+def painted():
+    print(f"first_paint_ms {(time.perf_counter() - t0) * 1000:.1f}", flush=True)
+    started = time.perf_counter()
+    reporting_app.preload_scraping_stack().join()
+    print(f"preload_ms {(time.perf_counter() - started) * 1000:.1f}", flush=True)
+    app.quit()
+
+QTimer.singleShot(0, painted)
+app.exec_()
+"""
+
+# ================= MEASUREMENTS =================
+
+def import_times(env):
+    """{module: cumulative import ms} for one `import reporting_app`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import reporting_app"],
+        cwd=HERE, env=env, capture_output=True, text=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        if cumulative.strip().isdigit():
+            # First (outermost) import of a module is the one that paid for it
+            times.setdefault(name, int(cumulative) / 1000)
+    return times
+
+
+def first_paint(env):
+    """(process start -> first paint ms, in-process ms, background preload ms)."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", FIRST_PAINT_SCRIPT],
+        cwd=HERE, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    wall = in_process = preload = None
+    for line in proc.stdout:
+        if line.startswith("first_paint_ms"):
+            wall = (time.perf_counter() - started) * 1000
+            in_process = float(line.split()[1])
+        elif line.startswith("preload_ms"):
+            preload = float(line.split()[1])
+    proc.wait()
+    return wall, in_process, preload
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure GUI import and first-paint time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--offscreen", action="store_true", help="use the offscreen Qt platform (no display)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    runs = [import_times(env) for _ in range(args.runs)]
+    print(f"Import time of reporting_app (median of {args.runs} runs, cumulative ms):")
+    for name in ("reporting_app",) + WATCHED:
+        samples = [r[name] for r in runs if name in r]
+        if samples:
+            print(f"  {name:<20} {statistics.median(samples):8.1f}")
+        else:
+            print(f"  {name:<20} {'deferred':>8}")
+
+    paints = [first_paint(env) for _ in range(args.runs)]
+    paints = [p for p in paints if p[0] is not None]
+    if not paints:
+        sys.exit("❌ The login window never painted (no display? try --offscreen)")
+    print(f"\nLogin window (median of {len(paints)} runs):")
+    print(f"  process start -> first paint   {statistics.median(p[0] for p in paints):8.1f} ms")
+    print(f"  of which in the interpreter    {statistics.median(p[1] for p in paints):8.1f} ms")
+    preloads = [p[2] for p in paints if p[2] is not None]
+    if preloads:
+        print(f"  background preload afterwards  {statistics.median(preloads):8.1f} ms")
@@ -0,0 +1,162 @@
+"""
+End-to-end benchmark of the report pipeline on synthetic SSRS pages.
+
+For each size, times extract(), organize() and get_shift() over every row
+(cold and warm timestamp cache), the peak Python memory of extract+organize,
+and MonitoringScreen.update_stations_from_data() redraws (offscreen). Results
+can be saved as a baseline and later runs compared against it; any metric
+slower/larger than the baseline by more than --tolerance fails the run.
+
+    python benchmark.py                                   # 1k, 10k, 100k rows
+    python benchmark.py 1000 1000000
+    python benchmark.py --save bench_baseline.json
+    python benchmark.py --compare bench_baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+import reporting_app as app
+import shifts
+from report_parser import default_engine
+from synthetic_report import make_report_html
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+REDRAW_CYCLES = 20
+
+# ================= HELPERS =================
+
+def best_of(fn, repeat):
+    """(best wall time in ms, last result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def shift_all(rows):
+    for r in rows:
+        app.get_shift(r.txn_date)
+
+
+def peak_memory_mb(html):
+    tracemalloc.start()
+    app.organize(app.extract(html))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def redraw_ms(screen, snapshots):
+    """Average update_stations_from_data() time, alternating snapshots so every cycle changes something."""
+    t0 = time.perf_counter()
+    for i in range(REDRAW_CYCLES):
+        screen.update_stations_from_data(snapshots[i % len(snapshots)])
+    QApplication.processEvents()
+    return (time.perf_counter() - t0) * 1000 / REDRAW_CYCLES
+
+# ================= BENCH =================
+
+def bench(n_rows, screen):
+    repeat = 3 if n_rows < 1000000 else 1
+    t0 = time.perf_counter()
+    html = make_report_html(n_rows)
+    generate = (time.perf_counter() - t0) * 1000
+
+    extract, rows = best_of(lambda: app.extract(html), repeat)
+    organize, organized = best_of(lambda: app.organize(rows), repeat)
+
+    shifts.second_of_day.cache_clear()
+    shift_cold, _ = best_of(lambda: shift_all(rows), 1)
+    shift_warm, _ = best_of(lambda: shift_all(rows), repeat)
+
+    # Second snapshot with half the rows: stations flip between states each redraw
+    redraw = redraw_ms(screen, [organized, app.organize(rows[:len(rows) // 2])])
+    memory = peak_memory_mb(html)
+
+    return {
+        "rows": len(rows),
+        "html_mb": round(len(html) / 1e6, 2),
+        "generate_ms": round(generate, 2),
+        "extract_ms": round(extract, 2),
+        "organize_ms": round(organize, 2),
+        "get_shift_cold_ms": round(shift_cold, 2),
+        "get_shift_warm_ms": round(shift_warm, 2),
+        "redraw_ms": round(redraw, 3),
+        "peak_mb": round(memory, 2),
+    }
+
+
+# Metrics checked against a baseline (generation time is not the app's cost)
+TRACKED = ("extract_ms", "organize_ms", "get_shift_cold_ms", "get_shift_warm_ms", "redraw_ms", "peak_mb")
+
+def compare(results, baseline, tolerance):
+    """Prints per-metric ratios; returns the list of regressions."""
+    regressions = []
+    for size, metrics in results.items():
+        old = baseline.get("results", {}).get(size)
+        if not old:
+            print(f"  {size:>8} rows: no baseline")
+            continue
+        for key in TRACKED:
+            if not old.get(key):
+                continue
+            ratio = metrics[key] / old[key]
+            flag = "REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"  {size:>8} rows  {key:<18} {old[key]:>10} -> {metrics[key]:>10}  x{ratio:5.2f} {flag}")
+            if flag:
+                regressions.append((size, key, ratio))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark extract/organize/get_shift/redraw on synthetic reports.")
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--save", metavar="JSON", help="write results as a baseline")
+    parser.add_argument("--compare", metavar="JSON", help="fail on regressions against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio (default 0.25 = 25%%)")
+    args = parser.parse_args()
+
+    qt_app = QApplication(sys.argv)
+    screen = app.MonitoringScreen("C-BENCH")
+    screen.resize(1280, 900)
+
+    print(f"Python {platform.python_version()}, parser engine: {default_engine()}")
+    print(f"{'rows':>8} {'MB':>7} {'extract':>10} {'organize':>10} {'shift cold':>11} {'shift warm':>11} {'redraw':>9} {'peak MB':>8}")
+    results = {}
+    for n in args.sizes:
+        r = bench(n, screen)
+        results[str(n)] = r
+        print(f"{r['rows']:>8} {r['html_mb']:>7} {r['extract_ms']:>8.1f}ms {r['organize_ms']:>8.1f}ms "
+              f"{r['get_shift_cold_ms']:>9.1f}ms {r['get_shift_warm_ms']:>9.1f}ms {r['redraw_ms']:>7.2f}ms {r['peak_mb']:>8.1f}")
+
+    report = {
+        "python": platform.python_version(),
+        "engine": default_engine(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} ({baseline.get('created', '?')}, tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s)")
+            sys.exit(1)
+        print("✅ No regressions")
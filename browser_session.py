@@ -0,0 +1,207 @@
+"""
+Reusable Chrome sessions for the monitor threads.
+
+Starting Chrome, logging in and loading the ReportViewer takes tens of
+seconds, so a monitor thread borrows a BrowserSession from a SessionManager
+and hands it back when it stops instead of quitting the browser. The next
+Start with the same credentials gets the live, authenticated session with
+the report already loaded, and only re-submits the report parameters (or
+nothing, if the container is unchanged).
+
+    session = SESSIONS.acquire(username, password, container)
+    ...                                  # session.sb is the SeleniumBase SB object
+    SESSIONS.release(session)            # kept alive for the next run
+    SESSIONS.close_all()                 # on application exit
+
+DHR_BROWSER_MODE=lean runs Chrome headless in a small window with images,
+fonts and media blocked and extensions/GPU off (see BROWSER_MODES).
+"""
+import os
+import threading
+
+# Optional persistent Chrome profile directory (cookies, cache) for the first
+# session, so even the first Start after an app restart loads warm.
+PROFILE_DIR_ENV = "DHR_BROWSER_PROFILE"
+
+# "full": visible Chrome with default options (what an operator can watch).
+# "lean": nothing the text-only report needs is loaded or drawn.
+BROWSER_MODE_ENV = "DHR_BROWSER_MODE"
+DEFAULT_BROWSER_MODE = "full"
+BROWSER_MODES = {
+    "full": {"headless": False},
+    "lean": {
+        "headless": True,
+        "block_images": True,
+        "window_size": "1024,768",
+        "chromium_arg": "--disable-extensions,--disable-gpu,--disable-component-extensions-with-background-pages",
+    },
+}
+
+# Blocked through the DevTools protocol in lean mode: fonts and media are not
+# covered by block_images, and the report renders fine with system fonts
+LEAN_BLOCKED_URLS = (
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav",
+)
+
+# ================= SESSION =================
+
+class BrowserSession:
+    """One Chrome instance plus the ReportViewer state its last user left behind."""
+
+    def __init__(self, username, password, profile_dir=None, mode=DEFAULT_BROWSER_MODE):
+        self.username = username
+        self.password = password
+        self.profile_dir = profile_dir
+        self.mode = mode
+        self.report_open = False     # logged in, ReportViewer loaded
+        self.container = None        # container whose parameters are currently submitted
+        self.iframe_selector = None  # working report iframe selector (see switch_into_report_iframe)
+        # seleniumbase takes ~0.5 s to import: loaded on first use (or by the app's background preload)
+        from seleniumbase import SB
+        # SB is a context manager; the session keeps it entered until quit()
+        self._cm = SB(browser="chrome", user_data_dir=profile_dir, **BROWSER_MODES[mode])
+        self.sb = self._cm.__enter__()
+        if mode == "lean":
+            self.block_urls(LEAN_BLOCKED_URLS)
+
+    def block_urls(self, patterns):
+        try:
+            self.sb.driver.execute_cdp_cmd("Network.enable", {})
+            self.sb.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        except Exception as e:
+            print(f"⚠️ Could not block fonts/media in the browser: {e}")
+
+    def alive(self):
+        try:
+            self.sb.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def memory_mb(self):
+        """Resident memory of chromedriver and every Chrome process under it (None without psutil)."""
+        try:
+            import psutil   # optional, and kept off the startup path
+        except ImportError:
+            return None
+        try:
+            root = psutil.Process(self.sb.driver.service.process.pid)
+            procs = [root] + root.children(recursive=True)
+        except Exception:
+            return None
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass    # exited between listing and reading
+        return total / 1e6
+
+    def reset(self):
+        """Forgets the report state (e.g. after the iframe was lost); the browser and login stay."""
+        self.report_open = False
+        self.container = None
+        self.iframe_selector = None
+
+    def quit(self):
+        cm, self._cm = self._cm, None
+        if cm is None:
+            return
+        try:
+            cm.__exit__(None, None, None)
+        except Exception as e:
+            print(f"⚠️ Browser did not quit cleanly: {e}")
+
+# ================= MANAGER =================
+
+class SessionManager:
+    """Pool of idle BrowserSessions, shared by every monitor thread."""
+
+    def __init__(self, profile_dir=None, mode=DEFAULT_BROWSER_MODE):
+        if mode not in BROWSER_MODES:
+            raise ValueError(f"Unknown browser mode {mode!r} (expected one of {', '.join(BROWSER_MODES)})")
+        self.profile_dir = profile_dir
+        self.mode = mode
+        self.stats = {"created": 0, "reused": 0}
+        self._idle = []
+        self._profile_in_use = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def acquire(self, username, password, container=None):
+        """
+        An idle live session for these credentials (preferring one already
+        showing container), otherwise a new one. Idle sessions logged in as
+        someone else are quit.
+        """
+        with self._lock:
+            stale = [s for s in self._idle if (s.username, s.password) != (username, password)]
+            usable = [s for s in self._idle if s not in stale]
+            usable.sort(key=lambda s: s.container == container)
+            session = usable.pop() if usable else None
+            self._idle = usable
+        for s in stale:
+            self._discard(s)
+
+        if session is not None and not session.alive():
+            self._discard(session)
+            session = None
+        if session is not None:
+            with self._lock:
+                self.stats["reused"] += 1
+            return session
+
+        with self._lock:
+            use_profile = bool(self.profile_dir) and not self._profile_in_use
+            self._profile_in_use = self._profile_in_use or use_profile
+        try:
+            session = BrowserSession(username, password, self.profile_dir if use_profile else None, self.mode)
+        except Exception:
+            if use_profile:
+                with self._lock:
+                    self._profile_in_use = False
+            raise
+        with self._lock:
+            self.stats["created"] += 1
+        return session
+
+    def release(self, session):
+        """Returns a session for reuse (quit instead if the browser died or the manager is closed)."""
+        # Probed outside the lock: alive() is a WebDriver round trip
+        alive = session.alive()
+        with self._lock:
+            # Checked under the lock so close_all() can't miss a session released meanwhile
+            keep = alive and not self._closed
+            if keep:
+                self._idle.append(session)
+        if not keep:
+            self._discard(session)
+
+    def _discard(self, session):
+        session.quit()
+        if session.profile_dir:
+            # Only once the browser has let go of the profile directory
+            with self._lock:
+                self._profile_in_use = False
+
+    def close_all(self):
+        """Quits every idle session; sessions still in use are quit when released."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+
+def profile_dir_from_env():
+    path = os.environ.get(PROFILE_DIR_ENV, "")
+    return os.path.abspath(path) if path else None
+
+
+def browser_mode_from_env():
+    mode = os.environ.get(BROWSER_MODE_ENV, DEFAULT_BROWSER_MODE).strip().lower()
+    if mode not in BROWSER_MODES:
+        print(f"⚠️ Unknown {BROWSER_MODE_ENV}={mode!r}; using {DEFAULT_BROWSER_MODE}.")
+        return DEFAULT_BROWSER_MODE
+    return mode
@@ -0,0 +1,153 @@
+"""
+Rolling per-stage timings for the monitoring loop.
+
+Every stage of a refresh cycle (fetch, extract, organize, emit, deliver,
+apply, ...) keeps its last WINDOW durations; percentiles are computed on
+demand from that window, counts and sums are kept for the whole run. Gauges
+hold the latest value of a non-timing reading (e.g. browser memory). Safe to
+record from the monitor threads and the GUI thread at the same time.
+
+    METRICS = StageMetrics()
+    with METRICS.stage("extract"):
+        rows = extract(html)
+    METRICS.dump("dhr_metrics.prom")   # Prometheus textfile; any other extension -> JSON
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+DEFAULT_WINDOW = 200
+PERCENTILES = (50, 90, 99)
+PROM_METRIC = "dhr_stage_duration_seconds"
+PROM_GAUGE = "dhr_gauge"
+
+# ================= METRICS =================
+
+class StageMetrics:
+    """Stage name -> rolling window of durations (ms)."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._totals = {}   # stage -> [count, sum_ms] since start
+        self._marks = {}    # name -> perf_counter() of an event another thread will pick up
+        self._gauges = {}   # name -> latest value
+
+    def record(self, stage, ms):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._totals[stage] = [0, 0.0]
+            samples.append(ms)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += ms
+
+    def gauge(self, name, value):
+        """Sets gauge name to value (None is ignored)."""
+        if value is None:
+            return
+        with self._lock:
+            self._gauges[name] = value
+
+    def gauges(self):
+        with self._lock:
+            return dict(self._gauges)
+
+    @contextmanager
+    def stage(self, name):
+        """Times the with-block as one sample of stage name."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def mark(self, name):
+        """Timestamps an event (e.g. a signal emit) for a later record_since()."""
+        with self._lock:
+            self._marks[name] = time.perf_counter()
+
+    def record_since(self, name, stage):
+        """Records the time since mark(name) as stage; no-op if there is no pending mark."""
+        with self._lock:
+            started = self._marks.pop(name, None)
+        if started is not None:
+            self.record(stage, (time.perf_counter() - started) * 1000)
+
+    def summary(self):
+        """{stage: {count, sum_ms, last_ms, p50_ms, p90_ms, p99_ms, max_ms}}, percentiles over the window."""
+        with self._lock:
+            snapshot = [
+                (stage, sorted(samples), samples[-1], tuple(self._totals[stage]))
+                for stage, samples in self._samples.items()
+            ]
+        out = {}
+        for stage, ordered, last, (count, total) in snapshot:
+            n = len(ordered)
+            entry = {"count": count, "sum_ms": round(total, 3), "last_ms": round(last, 3)}
+            for p in PERCENTILES:
+                # Nearest-rank percentile
+                entry[f"p{p}_ms"] = round(ordered[max(0, -(-n * p // 100) - 1)], 3)
+            entry["max_ms"] = round(ordered[-1], 3)
+            out[stage] = entry
+        return out
+
+    # ---- Output formats ----
+
+    def to_json(self):
+        return json.dumps({"updated": time.time(), "window": self.window, "stages": self.summary(),
+                           "gauges": self.gauges()}, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition (node_exporter textfile collector), one summary per stage."""
+        lines = [
+            f"# HELP {PROM_METRIC} DHR monitor stage duration (quantiles over the last {self.window} samples).",
+            f"# TYPE {PROM_METRIC} summary",
+        ]
+        for stage, entry in sorted(self.summary().items()):
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            for p in PERCENTILES:
+                lines.append(f'{PROM_METRIC}{{stage="{label}",quantile="{p / 100}"}} {entry[f"p{p}_ms"] / 1000:.6f}')
+            lines.append(f'{PROM_METRIC}_sum{{stage="{label}"}} {entry["sum_ms"] / 1000:.6f}')
+            lines.append(f'{PROM_METRIC}_count{{stage="{label}"}} {entry["count"]}')
+        gauges = self.gauges()
+        if gauges:
+            lines.append(f"# HELP {PROM_GAUGE} DHR monitor readings (latest value).")
+            lines.append(f"# TYPE {PROM_GAUGE} gauge")
+            for name, value in sorted(gauges.items()):
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{PROM_GAUGE}{{name="{label}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+    def to_table(self):
+        """Fixed-width text table, for logs and the on-screen overlay."""
+        lines = [f"{'stage':<22}{'p50':>9}{'p90':>9}{'p99':>9}{'n':>7}"]
+        for stage, e in sorted(self.summary().items()):
+            lines.append(f"{stage:<22}{e['p50_ms']:>9.1f}{e['p90_ms']:>9.1f}{e['p99_ms']:>9.1f}{e['count']:>7}")
+        for name, value in sorted(self.gauges().items()):
+            lines.append(f"{name:<22}{value:>9.1f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """Atomically writes the metrics to path (.prom -> Prometheus text, otherwise JSON)."""
+        body = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        # One temp file per writer (monitor threads, processes sharing the path); a plain
+        # open() keeps the umask permissions the textfile collector needs to read it
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(body)
+            # Readers (textfile collector, dashboards) never see a half-written file
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
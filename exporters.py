@@ -0,0 +1,243 @@
+"""
+Streaming row exporters for report.py.
+
+Rows are written as they are parsed; the columnar formats buffer one batch
+(BATCH_ROWS) at a time, so exporting a month of pages takes the same memory
+as exporting one. The format follows the file name:
+
+    rows.csv, rows.csv.gz       CSV (gzip-compressed with .gz)
+    rows.jsonl, rows.jsonl.gz   JSON Lines, one object per row
+    rows.npz                    NumPy (needs numpy): string columns dictionary-encoded as
+                                <col>_codes (uint32) + <col>_values, txn_date as datetime64[s]
+    rows.parquet                Parquet (needs pyarrow): dictionary-encoded strings, timestamp txn_date
+
+    with open_exporter("rows.parquet", Row._fields) as out:
+        out.write(rows)          # any number of times
+
+    columns = load_npz("rows.npz")           # {column: decoded numpy array}
+    df = pandas.DataFrame(columns)           # or pandas.read_parquet("rows.parquet")
+"""
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+from history_store import sortable_ts
+
+BATCH_ROWS = 65536
+
+# Parsed into a datetime column by the columnar formats; every other field is a string
+TIMESTAMP_FIELD = "txn_date"
+
+# ================= TEXT FORMATS =================
+
+def _open_text(path):
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+class Exporter:
+    """Base: write(rows) any number of times, then close() (or use as a context manager)."""
+
+    def __init__(self, path, fields):
+        self.path = path
+        self.fields = tuple(fields)
+
+    def write(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvExporter(Exporter):
+    def __init__(self, path, fields):
+        super().__init__(path, fields)
+        self._file = _open_text(path)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fields)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlExporter(Exporter):
+    def __init__(self, path, fields):
+        super().__init__(path, fields)
+        self._file = _open_text(path)
+
+    def write(self, rows):
+        fields, dumps = self.fields, json.dumps
+        self._file.writelines(dumps(dict(zip(fields, row)), separators=(",", ":")) + "\n" for row in rows)
+
+    def close(self):
+        self._file.close()
+
+# ================= COLUMNAR FORMATS =================
+
+class _BatchExporter(Exporter):
+    """Buffers rows and hands them to write_batch(columns) BATCH_ROWS at a time."""
+
+    def __init__(self, path, fields):
+        super().__init__(path, fields)
+        self._batch = []
+
+    def write(self, rows):
+        batch = self._batch
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_ROWS:
+                self._flush()
+                batch = self._batch
+
+    def _flush(self):
+        if self._batch:
+            self.write_batch(list(zip(*self._batch)))
+            self._batch = []
+
+    def write_batch(self, columns):
+        raise NotImplementedError
+
+    def close(self):
+        self._flush()
+
+
+class NpzExporter(_BatchExporter):
+    """
+    Streams codes and timestamps to one temp file per column; close() copies
+    them into the .npz with the dictionaries, so only the dictionaries (bounded
+    by distinct values, not rows) stay in memory.
+    """
+
+    def __init__(self, path, fields):
+        try:
+            import numpy
+        except ImportError as e:
+            raise RuntimeError("❌ .npz export needs numpy (pip install numpy)") from e
+        super().__init__(path, fields)
+        self.np = numpy
+        self.rows = 0
+        self._values = {f: {} for f in self.fields if f != TIMESTAMP_FIELD}
+        self._tmp = {f: tempfile.TemporaryFile() for f in self.fields}
+
+    def write_batch(self, columns):
+        np = self.np
+        for field, column in zip(self.fields, columns):
+            if field == TIMESTAMP_FIELD:
+                data = np.array([sortable_ts(t) for t in column], dtype="datetime64[s]")
+            else:
+                values = self._values[field]
+                data = np.fromiter(
+                    (values.setdefault(v, len(values)) for v in column), dtype=np.uint32, count=len(column)
+                )
+            self._tmp[field].write(data.tobytes())
+        self.rows += len(columns[0])
+
+    def _write_npy(self, archive, name, dtype, source=None, array=None):
+        fmt = self.np.lib.format
+        with archive.open(f"{name}.npy", "w", force_zip64=True) as out:
+            if array is not None:
+                fmt.write_array(out, array, allow_pickle=False)
+                return
+            header = {"descr": fmt.dtype_to_descr(self.np.dtype(dtype)), "fortran_order": False, "shape": (self.rows,)}
+            fmt.write_array_header_1_0(out, header)
+            source.seek(0)
+            shutil.copyfileobj(source, out)
+
+    def close(self):
+        super().close()
+        # Uncompressed, like numpy.savez: np.load reads members without inflating them
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_STORED) as archive:
+            for field in self.fields:
+                tmp = self._tmp[field]
+                if field == TIMESTAMP_FIELD:
+                    self._write_npy(archive, field, "datetime64[s]", tmp)
+                else:
+                    self._write_npy(archive, f"{field}_codes", self.np.uint32, tmp)
+                    self._write_npy(archive, f"{field}_values", None, array=self.np.array(list(self._values[field]), dtype=str))
+                tmp.close()
+
+
+class ParquetExporter(_BatchExporter):
+    """One Parquet row group per batch, written as it fills."""
+
+    def __init__(self, path, fields):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise RuntimeError("❌ .parquet export needs pyarrow (pip install pyarrow)") from e
+        super().__init__(path, fields)
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([
+            (f, pyarrow.timestamp("s") if f == TIMESTAMP_FIELD else pyarrow.dictionary(pyarrow.int32(), pyarrow.string()))
+            for f in self.fields
+        ])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write_batch(self, columns):
+        pa = self.pa
+        arrays = []
+        for field, column in zip(self.fields, columns):
+            if field == TIMESTAMP_FIELD:
+                arrays.append(pa.array([sortable_ts(t) for t in column]).cast(pa.timestamp("s")))
+            else:
+                arrays.append(pa.array(column, pa.string()).dictionary_encode())
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        super().close()
+        self._writer.close()
+
+# ================= FACTORY =================
+
+# Longest suffix first
+EXPORTERS = {
+    ".csv.gz": CsvExporter,
+    ".jsonl.gz": JsonlExporter,
+    ".csv": CsvExporter,
+    ".jsonl": JsonlExporter,
+    ".npz": NpzExporter,
+    ".parquet": ParquetExporter,
+}
+
+def open_exporter(path, fields):
+    """Exporter for path, chosen by its extension."""
+    for suffix, cls in EXPORTERS.items():
+        if path.lower().endswith(suffix):
+            return cls(path, fields)
+    raise ValueError(f"Unknown export format for {path} (expected one of {', '.join(EXPORTERS)})")
+
+
+def load_npz(path):
+    """{column: numpy array} of a NpzExporter file, with dictionary-encoded columns decoded."""
+    import numpy as np
+    columns = {}
+    with np.load(path) as z:
+        for name in z.files:   # in field order
+            if name.endswith("_codes"):
+                field = name[:-len("_codes")]
+                columns[field] = z[f"{field}_values"][z[name]]
+            elif not name.endswith("_values"):
+                columns[name] = z[name]
+    return columns
+
+
+def export_rows(path, fields, rows):
+    """One-shot export of an iterable of rows."""
+    with open_exporter(path, fields) as out:
+        out.write(rows)
+    return os.path.getsize(path)
@@ -0,0 +1,199 @@
+"""
+Append-only history of extracted DHR rows (SQLite).
+
+Every refresh cycle's rows are ingested with dedup, so the same PASS row seen
+on a hundred refreshes is stored once. Rows are indexed by container, task
+list, employee and time and partitioned by day, which keeps retention (drop
+whole days) and past-shift queries cheap instead of re-scraping SSRS.
+
+    store = HistoryStore(DEFAULT_DB_PATH)
+    store.ingest("C-999", rows)                       # rows from extract()
+    store.query(employee="SmithJ", start="2025-12-01")
+
+    python history_store.py query --container C-999 --since 2025-12-01
+    python history_store.py maintain --retention-days 90
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# ================= CONFIG =================
+
+DEFAULT_RETENTION_DAYS = 90
+
+
+def user_data_dir():
+    """Per-user data directory: %LOCALAPPDATA%\\dhr-monitor on Windows, else ~/.local/share/dhr-monitor."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_DATA_HOME")
+    return os.path.join(base or os.path.join(os.path.expanduser("~"), ".local", "share"), "dhr-monitor")
+
+# Where the monitor keeps its history unless DHR_HISTORY_DB says otherwise
+DEFAULT_DB_PATH = os.path.join(user_data_dir(), "dhr_history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dhr_rows (
+    day        TEXT NOT NULL,          -- YYYY-MM-DD partition key
+    ts         TEXT NOT NULL,          -- YYYY-MM-DD HH:MM:SS, sortable
+    container  TEXT NOT NULL,
+    task_list  TEXT NOT NULL,
+    employee   TEXT NOT NULL,
+    task_item  TEXT NOT NULL,
+    txn_date   TEXT NOT NULL,          -- as shown in the report
+    first_seen REAL NOT NULL,          -- epoch seconds of the ingesting cycle
+    UNIQUE (container, task_list, employee, task_item, txn_date)
+);
+CREATE INDEX IF NOT EXISTS idx_rows_day ON dhr_rows (day);
+CREATE INDEX IF NOT EXISTS idx_rows_container_ts ON dhr_rows (container, ts);
+CREATE INDEX IF NOT EXISTS idx_rows_task_list_ts ON dhr_rows (task_list, ts);
+CREATE INDEX IF NOT EXISTS idx_rows_employee_ts ON dhr_rows (employee, ts);
+CREATE INDEX IF NOT EXISTS idx_rows_ts ON dhr_rows (ts);
+"""
+
+# Query result record: extract()'s Row fields plus the container
+HistoryRow = namedtuple("HistoryRow", ("container", "task_list", "employee", "task_item", "txn_date"))
+
+# ================= HELPERS =================
+
+@lru_cache(maxsize=65536)
+def sortable_ts(txn_date):
+    """'12/16/2025 3:04:05 PM' -> '2025-12-16 15:04:05' (memoized, timestamps repeat)."""
+    return datetime.strptime(txn_date, "%m/%d/%Y %I:%M:%S %p").strftime("%Y-%m-%d %H:%M:%S")
+
+# ================= STORE =================
+
+class HistoryStore:
+    """Thread-safe SQLite history store; one instance can be shared by all monitor threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def ingest(self, container, rows):
+        """
+        Inserts new rows, (task_list, employee, task_item, txn_date) records such
+        as extract()'s Rows (duplicates ignored). Returns the number actually added.
+        """
+        now = time.time()
+        container = container or ""
+        records = []
+        for task_list, employee, task_item, txn_date in rows:
+            try:
+                ts = sortable_ts(txn_date)
+            except ValueError:
+                continue
+            records.append((ts[:10], ts, container, task_list, employee, task_item, txn_date, now))
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO dhr_rows "
+                "(day, ts, container, task_list, employee, task_item, txn_date, first_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            return self.conn.total_changes - before
+
+    def query(self, container=None, task_list=None, employee=None, start=None, end=None, limit=None):
+        """
+        HistoryRows matching every given filter, oldest first. start/end are
+        inclusive "YYYY-MM-DD[ HH:MM:SS]" bounds.
+        """
+        where, params = [], []
+        for column, value in (("container", container), ("task_list", task_list), ("employee", employee)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            where.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            # A bare date includes the whole day
+            where.append("ts <= ?")
+            params.append(end if len(end) > 10 else f"{end} 23:59:59")
+
+        sql = "SELECT container, task_list, employee, task_item, txn_date FROM dhr_rows"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            return list(map(HistoryRow._make, self.conn.execute(sql, params)))
+
+    def days(self):
+        """Stored day partitions with their row counts."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT day, COUNT(*) FROM dhr_rows GROUP BY day ORDER BY day"
+            ).fetchall()
+
+    def purge_before(self, day):
+        """Drops every day partition older than day (YYYY-MM-DD). Returns rows removed."""
+        with self._lock, self.conn:
+            return self.conn.execute("DELETE FROM dhr_rows WHERE day < ?", (day,)).rowcount
+
+    def compact(self):
+        """Reclaims space left by purges and refreshes the query planner statistics."""
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("VACUUM")
+            self.conn.execute("ANALYZE")
+
+    def maintain(self, retention_days=DEFAULT_RETENTION_DAYS):
+        """Retention + compaction; cheap enough to run once per monitoring start."""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        removed = self.purge_before(cutoff)
+        if removed:
+            self.compact()
+        return removed
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+# ================= MAIN =================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query and maintain the DHR row history.")
+    parser.add_argument("--db", default=os.environ.get("DHR_HISTORY_DB") or DEFAULT_DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    q = sub.add_parser("query", help="print matching rows")
+    q.add_argument("--container")
+    q.add_argument("--task-list")
+    q.add_argument("--employee")
+    q.add_argument("--since", help="YYYY-MM-DD[ HH:MM:SS]")
+    q.add_argument("--until", help="YYYY-MM-DD[ HH:MM:SS]")
+    q.add_argument("--limit", type=int)
+
+    sub.add_parser("days", help="row count per stored day")
+
+    m = sub.add_parser("maintain", help="apply retention and compact")
+    m.add_argument("--retention-days", type=int, default=DEFAULT_RETENTION_DAYS)
+
+    args = parser.parse_args()
+    store = HistoryStore(args.db)
+
+    if args.command == "query":
+        t0 = time.perf_counter()
+        rows = store.query(args.container, args.task_list, args.employee, args.since, args.until, args.limit)
+        elapsed = (time.perf_counter() - t0) * 1000
+        for r in rows:
+            print(f"{r.txn_date:>22}  {r.container:<12} {r.task_list:<22} {r.employee:<16} {r.task_item}")
+        print(f"{len(rows)} rows in {elapsed:.1f} ms")
+    elif args.command == "days":
+        for day, count in store.days():
+            print(f"{day}  {count}")
+    elif args.command == "maintain":
+        print(f"Removed {store.maintain(args.retention_days)} rows older than {args.retention_days} days")
+
+    store.close()
@@ -0,0 +1,146 @@
+"""
+Building blocks for the staged fetch -> parse+organize -> GUI pipeline.
+
+LatestSlot is a one-item queue that keeps only the newest value, so a slow
+consumer never makes the producer wait and never works on a stale snapshot.
+ParseStage drains one in a background thread and runs the CPU-heavy parse in
+a worker process, so HTML parsing neither blocks fetching nor holds the GIL
+the Qt event loop needs.
+
+    stage = ParseStage(parse_report, on_parsed)
+    stage.start()
+    stage.submit(html, "page")      # from the fetch loop; replaces an unparsed older page
+    stage.submit_result(result)     # already computed: delivered in order with the parses
+    ...
+    stage.stop()
+"""
+import threading
+import time
+
+# ================= QUEUE =================
+
+class LatestSlot:
+    """Bounded (size 1) queue: put() replaces an unconsumed value instead of blocking."""
+
+    CLOSED = object()
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value = None
+        self._full = False
+        self._closed = False
+        self.dropped = 0    # values replaced before anyone took them
+
+    def put(self, value):
+        with self._cond:
+            if self._full:
+                self.dropped += 1
+            self._value, self._full = value, True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Newest value; LatestSlot.CLOSED once closed, None on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._full or self._closed, timeout):
+                return None
+            if self._closed:
+                return self.CLOSED
+            value, self._value, self._full = self._value, None, False
+            return value
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+# ================= STAGE =================
+
+class _Ready:
+    """A submit_result() value: handed to on_result without running fn."""
+
+    def __init__(self, result):
+        self.result = result
+
+
+class ParseStage:
+    """
+    Runs fn(*args) for the newest submitted args in a single worker process and
+    calls on_result(result, error, elapsed_ms) from the stage thread. Falls
+    back to running fn inline if the worker process dies. Every on_result
+    call comes from that one thread, in submission order.
+    """
+
+    def __init__(self, fn, on_result, use_process=True, name="parse-stage"):
+        self.fn = fn
+        self.on_result = on_result
+        self.slot = LatestSlot()
+        self.executor = None
+        self.stopped = False    # set by stop(): results still to come are dropped
+        if use_process:
+            # Imported here: multiprocessing is not needed until monitoring starts
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn: never fork a process that is running Qt and browser threads
+            self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, *args):
+        self.slot.put(args)
+
+    def submit_result(self, result):
+        """Queues a result computed elsewhere; on_result gets it with elapsed_ms None."""
+        self.slot.put(_Ready(result))
+
+    @property
+    def dropped(self):
+        return self.slot.dropped
+
+    def _call(self, args):
+        executor = self.executor
+        if executor is not None:
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                return executor.submit(self.fn, *args).result()
+            except BrokenProcessPool:
+                if self.stopped:
+                    raise   # stop() ended the worker
+                print("⚠️ Parse worker process died; parsing inline from now on.")
+                self.executor = None
+        return self.fn(*args)
+
+    def _run(self):
+        while True:
+            args = self.slot.get()
+            if args is LatestSlot.CLOSED or self.stopped:
+                break
+            if isinstance(args, _Ready):
+                self.on_result(args.result, None, None)
+                continue
+            started = time.perf_counter()
+            try:
+                result, error = self._call(args), None
+            except Exception as e:
+                result, error = None, e
+            if self.stopped:
+                break
+            self.on_result(result, error, (time.perf_counter() - started) * 1000)
+
+    def stop(self):
+        """
+        Stops taking work and drops every result still to come. A parse
+        running in the worker is ended with the worker process, so it neither
+        reaches on_result nor holds up interpreter exit.
+        """
+        self.stopped = True
+        self.slot.close()
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            # ProcessPoolExecutor cannot cancel a running call: end its worker
+            processes = list((getattr(executor, "_processes", None) or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
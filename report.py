@@ -1,21 +1,34 @@
-from bs4 import BeautifulSoup
+"""
+DHR report extraction CLI.
+
+    python report.py                                   # report_page.html -> extracted_tasks.csv + extracted_data.json
+    python report.py saved/ "audit/**/*.html" x.html   # batch: parse files, globs and directories in parallel
+    python report.py saved/ --workers 4 --out rows.csv.gz --out rows.parquet --json organized.json
+    python report.py --stream                          # huge page: mmap + incremental parse, flat memory
+
+Rows are streamed to every --out file as they are parsed; the format follows
+the extension (.csv, .csv.gz, .jsonl, .jsonl.gz, .npz, .parquet; see exporters.py).
+"""
 from datetime import datetime
-from collections import defaultdict
+import argparse
+import glob
 import json
-import re
-import csv
+import os
+import sys
+import time
+from itertools import islice
+
+from report_parser import ENGINES, Row, iter_pass_rows, iter_report_rows, iter_report_rows_file, default_engine
+from shifts import ShiftClassifier, shift_times_from_env
+from exporters import export_rows, open_exporter
 
 # ================= CONFIG =================
 
-SHIFT_TIMES = {
+SHIFT_TIMES = shift_times_from_env({
     "day":   ("8:00 AM",  "2:40 PM"),
     "swing": ("3:00 PM", "11:20 PM"),
-}
-
-USERNAME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9]*$")
-TIMESTAMP_RE = re.compile(
-    r"\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}:\d{2}\s+[AP]M"
-)
+})
+SHIFTS = ShiftClassifier(SHIFT_TIMES)
 
 # ================= HELPERS =================
 
@@ -23,164 +36,252 @@ def parse_ts(ts):
     return datetime.strptime(ts, "%m/%d/%Y %I:%M:%S %p")
 
 def get_shift(ts):
-    t = parse_ts(ts).time()
-    for shift, (start, end) in SHIFT_TIMES.items():
-        if datetime.strptime(start, "%I:%M %p").time() <= t <= datetime.strptime(end, "%I:%M %p").time():
-            return shift
-    return None
+    return SHIFTS.classify(ts)
 
-def is_task_list(text):
-    return bool(re.match(r"(MQI-\d+)|(DA-\d+.*MQI-\d+)", text))
+# ================= EXTRACTION =================
 
-def is_timestamp(text):
-    return bool(TIMESTAMP_RE.fullmatch(text))
+def iter_rows(html, engine=None):
+    """Yields the PASS rows of a report page as they are parsed."""
+    report = iter_report_rows(html, ("oReportDiv",), engine)
+    if report is None:
+        raise RuntimeError("❌ oReportDiv not found")
+    return pass_rows(report)
 
-# ================= EXTRACTION =================
 
-def extract(html):
-    soup = BeautifulSoup(html, "html.parser")
-    report = soup.find("div", id=lambda x: x and "oReportDiv" in x)
-    if not report:
+def iter_file_rows(path):
+    """iter_rows() for a saved page, parsed incrementally from disk in flat memory."""
+    report = iter_report_rows_file(path, ("oReportDiv",))
+    if report is None:
         raise RuntimeError("❌ oReportDiv not found")
+    return pass_rows(report)
 
-    rows = []
-    state = {
-        "task_list": None,
-        "employee": None,
-    }
 
-    for tr in report.find_all("tr"):
-        tds = tr.find_all("td", recursive=False)
-        if not tds:
-            continue
+def pass_rows(report):
+    """
+    PASS rows from per-<tr> cell texts (report_parser.iter_pass_rows, the same
+    walk as the app). The task list and employee cells span rows (rowspan),
+    so they carry over from earlier rows, however the rows were chunked.
+    """
+    return iter_pass_rows(report, warn=True)
 
-        texts = [td.get_text(strip=True) for td in tds]
 
-        txn_date = next((t for t in texts if is_timestamp(t)), None)
-        if not txn_date:
-            continue  # Not a data row
+def extract(html, engine=None):
+    return list(iter_rows(html, engine))
 
-        # ---- Resolve task list + employee (rowspan safe) ----
-        seen_pass = False
-        for t in texts:
-            if t in ("PASS", "FAIL"):
-                seen_pass = True
-                continue
+# ================= ORGANIZATION =================
 
-            if is_task_list(t):
-                state["task_list"] = t
+class Organizer:
+    """
+    Incremental organize(): add() rows in any number of chunks, result() at
+    the end. Memory grows with distinct task lists/employees/tasks, not rows.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def add(self, rows):
+        names = SHIFTS.names
+        data = self.data
+        classify = SHIFTS.classify
+        for task_list, employee, task_item, txn_date in rows:
+            shift = classify(txn_date)
+            if not shift:
                 continue
 
-            if (
-                not seen_pass
-                and USERNAME_RE.fullmatch(t)
-            ):
-                state["employee"] = t
-
-        # ---- Task item + status are adjacent ----
-        task_item = None
-        status = None
-        for i in range(len(texts) - 1):
-            if texts[i + 1] in ("PASS", "FAIL"):
-                task_item = texts[i]
-                status = texts[i + 1]
-                break
-
-        if status != "PASS":
-            continue
-
-        if not state["task_list"]:
-            print(f"⚠️ Missing task list at {txn_date}")
-            continue
-
-        if not state["employee"]:
-            print(f"⚠️ Missing employee for {state['task_list']} at {txn_date}")
-            continue
-
-        rows.append({
-            "task_list": state["task_list"],
-            "employee": state["employee"],
-            "task_item": task_item,
-            "txn_date": txn_date,
-        })
-
-    return rows
+            shifts = data.get(task_list)
+            if shifts is None:
+                shifts = data[task_list] = {
+                    s: {"employee": "", "employees": set(), "tasks": set()} for s in names
+                }
+            entry = shifts[shift]
+
+            # Lock first employee, but track multiples
+            if not entry["employee"]:
+                entry["employee"] = employee
+            entry["employees"].add(employee)
+
+            entry["tasks"].add(task_item)
+        return self
+
+    def result(self):
+        result = []
+        for task_list, shifts in sorted(self.data.items()):
+            out = {task_list: {}}
+            for s in SHIFTS.names:
+                out[task_list][s] = {
+                    "employee": shifts[s]["employee"],
+                    "task_completed": tuple(sorted(shifts[s]["tasks"])),
+                    "total_passed": len(shifts[s]["tasks"]),
+                }
+
+                if len(shifts[s]["employees"]) > 1:
+                    print(
+                        f"⚠️ Multiple employees for {task_list} ({s}): "
+                        f"{', '.join(sorted(shifts[s]['employees']))}"
+                    )
+
+            result.append(out)
+
+        return result
 
-# ================= ORGANIZATION =================
 
 def organize(rows):
-    data = defaultdict(lambda: {
-        "day": {
-            "employee": "",
-            "employees": set(),
-            "tasks": set(),
-        },
-        "swing": {
-            "employee": "",
-            "employees": set(),
-            "tasks": set(),
-        }
-    })
-
-    for r in rows:
-        shift = get_shift(r["txn_date"])
-        if not shift:
-            continue
-
-        entry = data[r["task_list"]][shift]
-
-        # Lock first employee, but track multiples
-        if not entry["employee"]:
-            entry["employee"] = r["employee"]
-        entry["employees"].add(r["employee"])
-
-        entry["tasks"].add(r["task_item"])
-
-    result = []
-    for task_list, shifts in sorted(data.items()):
-        out = {task_list: {}}
-        for s in ("day", "swing"):
-            out[task_list][s] = {
-                "employee": shifts[s]["employee"],
-                "task_completed": tuple(sorted(shifts[s]["tasks"])),
-                "total_passed": len(shifts[s]["tasks"]),
-            }
-
-            if len(shifts[s]["employees"]) > 1:
-                print(
-                    f"⚠️ Multiple employees for {task_list} ({s}): "
-                    f"{', '.join(sorted(shifts[s]['employees']))}"
-                )
-
-        result.append(out)
-
-    return result
+    return Organizer().add(rows).result()
 
 # ================= EXPORT =================
 
 def export_csv(rows, filename="extracted_tasks.csv"):
-    with open(filename, "w", newline="") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=["task_list", "employee", "task_item", "txn_date"]
-        )
-        writer.writeheader()
-        writer.writerows(rows)
-
-# ================= MAIN =================
-
-if __name__ == "__main__":
-    with open("report_page.html", encoding="utf-8") as f:
+    """rows (any iterable) -> CSV; .csv.gz, .jsonl, .npz and .parquet work too (see exporters.py)."""
+    export_rows(filename, Row._fields, rows)
+
+# ================= BATCH =================
+
+# Saved pages picked up when a directory is given
+REPORT_GLOBS = ("*.html", "*.htm")
+PROGRESS_EVERY = 50
+
+def expand_inputs(inputs):
+    """Files, globs and directories (searched recursively) -> sorted unique file paths."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for pattern in REPORT_GLOBS:
+                paths.update(glob.glob(os.path.join(item, "**", pattern), recursive=True))
+        elif glob.has_magic(item):
+            paths.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+        else:
+            paths.add(item)
+    return sorted(paths)
+
+
+def parse_file(path, engine=None, stream=False):
+    """Worker: (rows, size in bytes) of one saved report page."""
+    if stream:
+        return list(iter_file_rows(path)), os.path.getsize(path)
+    with open(path, encoding="utf-8") as f:
         html = f.read()
+    return extract(html, engine), os.path.getsize(path)
+
+
+def iter_parsed(paths, workers, engine=None, stream=False):
+    """(path, rows, size, error) per file, in completion order; parsed across a process pool."""
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                yield (path, *parse_file(path, engine, stream), None)
+            except (OSError, RuntimeError, UnicodeDecodeError) as e:
+                yield path, None, 0, e
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(parse_file, path, engine, stream): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield (futures[future], *future.result(), None)
+            except (OSError, RuntimeError, UnicodeDecodeError) as e:
+                yield futures[future], None, 0, e
+
+
+def run_batch(paths, outputs, json_path, workers, engine=None, stream=False):
+    """Streams every file's rows to the outputs as workers finish, organizing across all of them."""
+    started = time.perf_counter()
+    organizer = Organizer()
+    done = failed = total_rows = total_bytes = 0
+
+    exporters = [open_exporter(path, Row._fields + ("source",)) for path in outputs]
+    try:
+        for path, rows, size, error in iter_parsed(paths, workers, engine, stream):
+            if error is not None:
+                failed += 1
+                print(f"⚠️ {path}: {error}")
+                continue
+            tagged = [row + (path,) for row in rows]
+            for out in exporters:
+                out.write(tagged)
+            organizer.add(rows)
+            done += 1
+            total_rows += len(rows)
+            total_bytes += size
+            if done % PROGRESS_EVERY == 0:
+                print(f"  {done}/{len(paths)} files, {total_rows} rows")
+    finally:
+        for out in exporters:
+            out.close()
+    parsed = time.perf_counter() - started
+
+    result = organizer.result()
+    with open(json_path, "w") as f:
+        json.dump(result, f, separators=(",", ":"))
+    elapsed = time.perf_counter() - started
+
+    print(f"Parsed {done} files ({failed} failed), {total_rows} rows, {total_bytes / 1e6:.1f} MB "
+          f"in {parsed:.2f} s with {workers} worker(s)")
+    print(f"Throughput: {done / parsed:.1f} files/s, {total_rows / parsed:.0f} rows/s, "
+          f"{total_bytes / 1e6 / parsed:.1f} MB/s")
+    print(f"Organized {len(result)} task lists; total {elapsed:.2f} s")
+    print(f"Rows -> {', '.join(outputs)}, organized data -> {json_path}")
+    return failed
 
-    rows = extract(html)
-    print(f"Extracted rows: {len(rows)}")
-
-    export_csv(rows)
+# ================= MAIN =================
 
-    result = organize(rows)
+# Rows handed to the exporters and the organizer at a time in single-page mode
+CHUNK_ROWS = 10000
+
+def main_single(outputs, engine=None, stream=False):
+    """Original single-page run: report_page.html -> outputs + extracted_data.json, streamed."""
+    if stream:
+        rows = iter_file_rows("report_page.html")
+    else:
+        with open("report_page.html", encoding="utf-8") as f:
+            html = f.read()
+        rows = iter_rows(html, engine)
+
+    organizer = Organizer()
+    count = 0
+    exporters = [open_exporter(path, Row._fields) for path in outputs]
+    try:
+        for chunk in iter(lambda: list(islice(rows, CHUNK_ROWS)), []):
+            for out in exporters:
+                out.write(chunk)
+            organizer.add(chunk)
+            count += len(chunk)
+    finally:
+        for out in exporters:
+            out.close()
+    print(f"Extracted rows: {count}")
+
+    result = organizer.result()
 
     print(json.dumps(result, indent=2))
 
     with open("extracted_data.json", "w") as f:
         json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    # Frozen build: batch workers re-run this entry point and must not start another batch
+    import multiprocessing
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Extract and organize saved DHR report pages.")
+    parser.add_argument("inputs", nargs="*", help="report pages, globs or directories (default: report_page.html)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes (default: one per core)")
+    parser.add_argument("--engine", choices=list(ENGINES), help="HTML parser engine (default: fastest installed)")
+    parser.add_argument("--out", action="append", metavar="PATH",
+                        help="rows output, repeatable; format by extension (default: extracted_tasks.csv)")
+    parser.add_argument("--json", default="extracted_data.json", help="organized output (batch mode)")
+    parser.add_argument("--stream", action="store_true",
+                        help="parse pages incrementally from disk in flat memory (for multi-week exports)")
+    args = parser.parse_args()
+
+    outputs = args.out or ["extracted_tasks.csv"]
+
+    print(f"Parser engine: {'incremental' if args.stream else args.engine or default_engine()}")
+    if not args.inputs:
+        main_single(outputs, args.engine, args.stream)
+        sys.exit(0)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        sys.exit("❌ No report pages found")
+    sys.exit(1 if run_batch(paths, outputs, args.json, args.workers, args.engine, args.stream) else 0)
@@ -0,0 +1,184 @@
+"""
+Browserless fetch engine for the DHR report.
+
+Talks to the SSRS ReportServer URL-access endpoint with one persistent HTTP
+session (keep-alive, auth negotiated once) and renders the report directly in
+a machine-readable format instead of driving Chrome through the ReportViewer.
+
+    client = ReportHTTPClient(REPORT_SERVER_URL, REPORT_PATH, user, password)
+    body = client.fetch("C-999")
+    for texts in iter_export_cells(body, client.render_format): ...
+
+    # HTML4.0 is paginated: one page (rc:Section) per request, or all at once
+    pages = client.fetch_pages("C-999", range(1, 9), parse)   # concurrent, in page order
+
+iter_export_cells() yields per-row cell text lists, like report_parser, so the
+caller's extract() row heuristics turn them into the usual row dicts.
+"""
+import csv
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import quote, urlencode
+
+from report_parser import REPORT_DIV_IDS, iter_report_rows
+
+# ================= CONFIG =================
+
+REPORT_SERVER_URL = os.environ.get("DHR_REPORT_SERVER", "https://reporting.penumbrainc.com/ReportServer")
+REPORT_PATH = "/MES General/DHR Report - Mfg"
+
+# Report parameter names behind the ReportViewer container / date inputs
+PARAM_CONTAINER = "Container"
+PARAM_DATE = "Date"
+DATE_TODAY = "Today"
+
+RENDER_FORMATS = {
+    "CSV": "csv",
+    "XML": "xml",
+    "HTML4.0": "html",
+}
+DEFAULT_FORMAT = "CSV"
+
+# HTML4.0 renders one page per request (rc:Section=N, 1-based); ALL_PAGES
+# renders the whole report in one. CSV and XML are never paginated.
+PAGINATED_FORMATS = ("HTML4.0",)
+ALL_PAGES = 0
+
+# Pages requested at once by fetch_pages()
+PAGE_WORKERS = int(os.environ.get("DHR_PAGE_WORKERS", "4"))
+
+# ================= CLIENT =================
+
+class ReportHTTPClient:
+    """Persistent HTTP session that renders the DHR report for a container."""
+
+    def __init__(self, server_url, report_path, username, password,
+                 render_format=DEFAULT_FORMAT, timeout=30, record_dir=None):
+        if render_format not in RENDER_FORMATS:
+            raise ValueError(f"Unsupported render format: {render_format!r}")
+        self.server_url = server_url.rstrip("/")
+        self.report_path = report_path
+        self.render_format = render_format
+        self.timeout = timeout
+        # Every fetched body is also saved here, for replay through report_stub_server.py
+        self.record_dir = record_dir
+
+        # Imported here, not at module level: the GUI imports this module before its first paint
+        import requests
+        try:
+            from requests_ntlm import HttpNtlmAuth
+        except ImportError:
+            HttpNtlmAuth = None
+
+        self.session = requests.Session()
+        # One pooled keep-alive connection per concurrent page request
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(PAGE_WORKERS, 10))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if HttpNtlmAuth is not None:
+            self.session.auth = HttpNtlmAuth(username, password)
+        else:
+            self.session.auth = (username, password)
+
+    def report_url(self, container, date=DATE_TODAY, page=ALL_PAGES):
+        params = {
+            "rs:Command": "Render",
+            "rs:Format": self.render_format,
+            PARAM_CONTAINER: container,
+            PARAM_DATE: date,
+        }
+        if self.render_format in PAGINATED_FORMATS:
+            params["rc:Section"] = page
+        return f"{self.server_url}?{quote(self.report_path, safe='/')}&{urlencode(params, safe=':')}"
+
+    def fetch(self, container, date=DATE_TODAY, page=ALL_PAGES):
+        """Returns the rendered report body as text (page: see ALL_PAGES)."""
+        resp = self.session.get(self.report_url(container, date, page), timeout=self.timeout)
+        if resp.status_code == 401:
+            raise RuntimeError("❌ Report server rejected the credentials (401).")
+        resp.raise_for_status()
+        # SSRS prefixes CSV output with a UTF-8 BOM
+        body = resp.content.decode("utf-8-sig", errors="replace")
+
+        if self.record_dir:
+            os.makedirs(self.record_dir, exist_ok=True)
+            name = f"{container}.p{page}" if page != ALL_PAGES else container
+            name = f"{name}.{RENDER_FORMATS[self.render_format]}"
+            with open(os.path.join(self.record_dir, name), "w", encoding="utf-8") as f:
+                f.write(body)
+        return body
+
+    def fetch_pages(self, container, pages, parse=None, date=DATE_TODAY, workers=PAGE_WORKERS):
+        """
+        [parse(body) for each page], in the order of pages. The pages are
+        requested concurrently and each is parsed in its fetch thread as soon
+        as it arrives, overlapping with the requests still in flight.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def fetch_one(page):
+            body = self.fetch(container, date, page)
+            return parse(body) if parse else body
+
+        pages = list(pages)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pages)))) as executor:
+            return list(executor.map(fetch_one, pages))
+
+    def close(self):
+        self.session.close()
+
+# ================= PARSING =================
+
+ISO_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+
+def _cell(value):
+    # Data renderers can emit raw ISO datetimes; match the ReportViewer display
+    # format (en-US general date, no zero padding: 12/1/2025 3:04:05 PM)
+    value = value.strip()
+    if ISO_TS_RE.match(value):
+        ts = datetime.fromisoformat(value[:19])
+        return f"{ts.month}/{ts.day}/{ts.year} {(ts.hour - 1) % 12 + 1}:{ts:%M:%S %p}"
+    return value
+
+
+def _csv_cells(body):
+    for record in csv.reader(io.StringIO(body)):
+        texts = [_cell(value) for value in record]
+        if any(texts):
+            yield texts
+
+
+def _xml_cells(body):
+    # Group attributes (task list, employee) live on ancestor elements; prepend
+    # them to every detail element so the row heuristics see the full context.
+    def walk(el, inherited):
+        own = inherited + [_cell(value) for value in el.attrib.values()]
+        children = list(el)
+        if not children:
+            if own:
+                yield own
+            return
+        for child in children:
+            yield from walk(child, own)
+
+    root = ET.fromstring(body.encode("utf-8"))
+    # The root element's attributes are report metadata, not data
+    for child in root:
+        yield from walk(child, [])
+
+
+def iter_export_cells(body, render_format, div_ids=REPORT_DIV_IDS):
+    """Yields per-row cell text lists from a rendered report body."""
+    if render_format == "CSV":
+        return _csv_cells(body)
+    if render_format == "XML":
+        return _xml_cells(body)
+    if render_format == "HTML4.0":
+        cells = iter_report_rows(body, div_ids)
+        if cells is None:
+            raise RuntimeError("❌ Report content div not found in HTML4.0 render.")
+        return cells
+    raise ValueError(f"Unsupported render format: {render_format!r}")
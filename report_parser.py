@@ -0,0 +1,601 @@
+"""
+Pluggable HTML engines for walking the rows of an SSRS ReportViewer page.
+
+Every engine answers the same question: "give me the stripped text of the
+direct <td> children of every <tr> inside the report div", in document
+order. The row heuristics (task list / employee / PASS) are applied to any
+engine's output by iter_pass_rows(), shared by the app and the CLI, so every
+engine returns exactly the same Row records.
+
+Engines, fastest first: selectolax, lxml, bs4 (reference / fallback).
+The fast engines seek straight to the report div in the raw text and only
+parse that subtree instead of the whole page (scripts, viewstate, toolbar).
+"""
+import hashlib
+import itertools
+import os
+import re
+import sys
+from collections import namedtuple
+
+# Engine libraries are imported on first use (see _backend) so that importing
+# this module, and the app's login window, doesn't wait for them.
+_SelectolaxParser = None
+_lxml_etree = None
+BeautifulSoup = None
+
+# ================= CONFIG =================
+
+# Substrings of the report div id, tried in order.
+REPORT_DIV_IDS = ("oReportDiv",)
+
+ENGINE_ORDER = ("selectolax", "lxml", "bs4")
+
+# Forces an engine instead of the fastest installed one, e.g. DHR_PARSER_ENGINE=bs4
+ENGINE_ENV = "DHR_PARSER_ENGINE"
+
+DIV_TAG_RE = re.compile(r"<(/?)(?i:div)\b[^>]*>")
+
+# ================= ROW RECORDS =================
+
+# One extracted PASS row. Tuple-backed (no per-row dict); extract() interns the
+# task list / employee / task item strings, which repeat across rows and cycles.
+Row = namedtuple("Row", ("task_list", "employee", "task_item", "txn_date"))
+
+# ================= HELPERS =================
+
+def _seek_report_div(html, pattern):
+    """Returns the offset of the first <div> whose id contains pattern, or -1."""
+    m = re.search(
+        r"<(?i:div)\b[^>]*?\b(?i:id)\s*=\s*[\"']?[^\"'\s>]*" + re.escape(pattern),
+        html,
+    )
+    return m.start() if m else -1
+
+
+def report_region(html, div_ids=REPORT_DIV_IDS):
+    """
+    Returns the raw outer HTML of the report div (balanced on <div> tags)
+    without parsing anything, or None if no div id matches.
+    """
+    for pattern in div_ids:
+        start = _seek_report_div(html, pattern)
+        if start < 0:
+            continue
+        depth = 0
+        for m in DIV_TAG_RE.finditer(html, start):
+            depth += -1 if m.group(1) else 1
+            if depth == 0:
+                return html[start:m.end()]
+        return html[start:]
+    return None
+
+
+def report_fingerprint(html, div_ids=REPORT_DIV_IDS):
+    """Content hash of the report div, or None if it can't be located."""
+    region = report_region(html, div_ids)
+    if region is None:
+        return None
+    return hashlib.blake2b(region.encode("utf-8"), digest_size=16).hexdigest()
+
+# ================= ENGINES =================
+
+def _rows_bs4(html, div_ids):
+    soup = BeautifulSoup(html, "html.parser")
+    report = None
+    for pattern in div_ids:
+        report = soup.find("div", id=lambda x, p=pattern: x and p in x)
+        if report:
+            break
+    if not report:
+        return None
+
+    def rows():
+        for tr in report.find_all("tr"):
+            tds = tr.find_all("td", recursive=False)
+            if tds:
+                yield [td.get_text(strip=True) for td in tds]
+
+    return rows()
+
+
+def _lxml_text(td):
+    # Same as bs4 get_text(strip=True): every text node stripped, comments skipped.
+    parts = [td.text.strip()] if td.text else []
+    for el in td.iterdescendants():
+        if isinstance(el.tag, str) and el.text:
+            parts.append(el.text.strip())
+        if el.tail:
+            parts.append(el.tail.strip())
+    return "".join(parts)
+
+
+def _lxml_find(html, pattern):
+    parser = _lxml_etree.HTMLParser(encoding="utf-8")
+    root = _lxml_etree.fromstring(html.encode("utf-8"), parser)
+    if root is None:
+        return None
+    for div in root.iter("div"):
+        div_id = div.get("id")
+        if div_id and pattern in div_id:
+            return div
+    return None
+
+
+def _rows_lxml(html, div_ids):
+    report = None
+    for pattern in div_ids:
+        region = report_region(html, (pattern,))
+        if region is not None:
+            report = _lxml_find(region, pattern)
+        if report is None:
+            report = _lxml_find(html, pattern)
+        if report is not None:
+            break
+    if report is None:
+        return None
+
+    def rows():
+        for tr in report.iter("tr"):
+            texts = [_lxml_text(td) for td in tr if td.tag == "td"]
+            if texts:
+                yield texts
+
+    return rows()
+
+
+def _selectolax_find(html, pattern):
+    return _SelectolaxParser(html).css_first(f'div[id*="{pattern}"]')
+
+
+def _rows_selectolax(html, div_ids):
+    report = None
+    for pattern in div_ids:
+        region = report_region(html, (pattern,))
+        if region is not None:
+            report = _selectolax_find(region, pattern)
+        if report is None:
+            report = _selectolax_find(html, pattern)
+        if report is not None:
+            break
+    if report is None:
+        return None
+
+    def rows():
+        for tr in report.css("tr"):
+            texts = [
+                td.text(deep=True, separator="", strip=True)
+                for td in tr.iter()
+                if td.tag == "td"
+            ]
+            if texts:
+                yield texts
+
+    return rows()
+
+
+ENGINES = {
+    "selectolax": _rows_selectolax,
+    "lxml": _rows_lxml,
+    "bs4": _rows_bs4,
+}
+
+def _import_backend(name):
+    global _SelectolaxParser, _lxml_etree, BeautifulSoup
+    try:
+        if name == "selectolax":
+            try:
+                from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+            except ImportError:
+                # selectolax < 0.3 only ships the Modest backend
+                from selectolax.parser import HTMLParser as _SelectolaxParser
+            return _SelectolaxParser
+        if name == "lxml":
+            from lxml import etree as _lxml_etree
+            return _lxml_etree
+        if name == "bs4":
+            from bs4 import BeautifulSoup
+            return BeautifulSoup
+    except ImportError:
+        return None
+    return None
+
+
+_backends = {}
+
+def _backend(name):
+    """The engine's library, imported on first call; None if it is not installed."""
+    if name not in _backends:
+        _backends[name] = _import_backend(name)
+    return _backends[name]
+
+# ================= INCREMENTAL =================
+
+# Bytes fed to the incremental parser at a time
+STREAM_CHUNK_SIZE = 1 << 20
+
+DIV_TAG_BYTES_RE = re.compile(rb"<(/?)(?i:div)\b[^>]*>")
+TR_TAG_BYTES_RE = re.compile(rb"<(/?)(?i:tr)\b[^>]*>")
+ROW_END_BYTES_RE = re.compile(rb"</(?i:tr)\s*>")
+
+# Input after which the lxml stream switches to a fresh parser (see _stream_rows_lxml)
+PARSER_RESTART_BYTES = 16 << 20
+
+
+def _report_span(buf, div_ids, release=None):
+    """
+    (start, end) byte offsets of the report div in buf (e.g. an mmap), like
+    report_region(); None if absent. release(offset) is called every
+    STREAM_CHUNK_SIZE bytes scanned, so mapped pages can be dropped as it goes.
+    """
+    for pattern in div_ids:
+        m = re.search(
+            rb"<(?i:div)\b[^>]*?\b(?i:id)\s*=\s*[\"']?[^\"'\s>]*" + re.escape(pattern.encode("utf-8")),
+            buf,
+        )
+        if not m:
+            continue
+        depth = 0
+        next_release = m.start() + STREAM_CHUNK_SIZE
+        for tag in DIV_TAG_BYTES_RE.finditer(buf, m.start()):
+            depth += -1 if tag.group(1) else 1
+            if depth == 0:
+                return m.start(), tag.end()
+            if release and tag.start() >= next_release:
+                release(tag.start())
+                next_release = tag.start() + STREAM_CHUNK_SIZE
+        return m.start(), len(buf)
+    return None
+
+
+def _chunks(buf, start, end, chunk_size, release):
+    for offset in range(start, end, chunk_size):
+        stop = min(offset + chunk_size, end)
+        yield buf[offset:stop]
+        release(stop, offset)
+
+
+def _sibling_row_boundary(buf, offset, end):
+    """First offset at or after offset that ends a </tr> followed by a sibling <tr> (else end)."""
+    for m in ROW_END_BYTES_RE.finditer(buf, offset, end):
+        following = TR_TAG_BYTES_RE.search(buf, m.end(), end)
+        if following is None:
+            return end
+        if not following.group(1):
+            return m.end()
+    return end
+
+
+def _stream_rows_lxml(buf, span, chunk_size, release):
+    """
+    Pull parser, Python work per <tr> only; finished rows are cleared so the
+    tree stays small. libxml2 keeps all input of a push parse until it is
+    closed, so a fresh parser takes over every PARSER_RESTART_BYTES, at a
+    boundary between two sibling rows. A row containing rows (layout: its
+    cells are whole nested tables) is not yielded, since its text would only
+    be known once the whole nested table had been kept in memory.
+    """
+    start, end = span
+    prefix = b""
+    while start < end:
+        stop = _sibling_row_boundary(buf, start + PARSER_RESTART_BYTES, end)
+        parser = _lxml_etree.HTMLPullParser(events=("start", "end"), tag="tr", encoding="utf-8")
+        parser.feed(prefix)     # later segments start mid-table
+        open_rows = []          # [is layout row] per open <tr>
+        for chunk in itertools.chain(_chunks(buf, start, stop, chunk_size, release), (None,)):
+            if chunk is None:
+                parser.close()  # ends the still-open layout rows/tables
+            else:
+                parser.feed(chunk)
+            for event, tr in parser.read_events():
+                if event == "start":
+                    # A row containing rows is layout: its cells are whole nested tables
+                    open_rows = [True] * len(open_rows)
+                    open_rows.append(False)
+                    continue
+                if open_rows and not open_rows.pop():
+                    texts = [_lxml_text(td) for td in tr if td.tag == "td"]
+                    if texts:
+                        yield texts
+                tr.clear()
+                while tr.getprevious() is not None:
+                    del tr.getparent()[0]
+        start, prefix = stop, b"<table>"
+
+
+class _RowCollector:
+    """
+    html.parser fallback when lxml is missing: turns <tr>/<td> events into
+    stripped cell texts, appending completed rows to self.rows. Rows
+    containing rows are dropped as layout rows, like _stream_rows_lxml().
+    """
+
+    def __init__(self):
+        self.rows = []
+        self._open_rows = []    # stack of [cells or None (layout row), parts of the open <td> or None]
+        self._text = []         # raw pieces of the current text node
+
+    def _flush_text(self):
+        if self._text:
+            if self._open_rows and self._open_rows[-1][1] is not None:
+                self._open_rows[-1][1].append("".join(self._text).strip())
+            self._text = []
+
+    def start(self, tag):
+        self._flush_text()
+        if tag == "tr":
+            for row in self._open_rows:
+                row[0] = row[1] = None
+            self._open_rows.append([[], None])
+        elif tag == "td" and self._open_rows:
+            row = self._open_rows[-1]
+            if row[0] is not None and row[1] is None:
+                row[1] = []
+
+    def end(self, tag):
+        self._flush_text()
+        if tag == "tr" and self._open_rows:
+            cells = self._open_rows.pop()[0]
+            if cells:
+                self.rows.append(cells)
+        elif tag == "td" and self._open_rows:
+            row = self._open_rows[-1]
+            if row[1] is not None:
+                row[0].append("".join(row[1]))
+                row[1] = None
+
+    def data(self, text):
+        self._text.append(text)
+
+
+def _stream_rows_stdlib(chunks):
+    import codecs
+    from html.parser import HTMLParser
+
+    collector = _RowCollector()
+
+    class Parser(HTMLParser):
+        def handle_starttag(self, tag, attrs):
+            collector.start(tag)
+
+        def handle_endtag(self, tag):
+            collector.end(tag)
+
+        def handle_data(self, data):
+            collector.data(data)
+
+        def handle_comment(self, data):
+            # Comments split text nodes (get_text(strip=True) strips each node)
+            collector.start("#comment")
+
+    parser = Parser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        yield from collector.rows
+        collector.rows = []
+    parser.close()
+    yield from collector.rows
+
+
+def iter_report_rows_file(path, div_ids=REPORT_DIV_IDS, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Per-<tr> cell text lists of a saved page's report div, in bounded
+    memory. The file is memory-mapped, the report div located in it without
+    decoding, and only that span fed to an event-driven parser (lxml, else
+    html.parser) chunk by chunk; rows are yielded as their </tr> closes.
+    Memory depends on the chunk size, not the file size. Returns None if
+    there is no report div.
+
+    Not the same rows as iter_report_rows(): layout rows (rows containing
+    rows) are skipped here, while the engines yield them and leave them to
+    iter_pass_rows(), which takes the PASS rows from either.
+    """
+    import mmap
+
+    f = open(path, "rb")
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:      # empty file
+        f.close()
+        return None
+
+    # Mapped pages count as resident memory until released: drop them as the
+    # span search and the parser move past them
+    def release(end, start=0):
+        if hasattr(mmap, "MADV_DONTNEED"):
+            start -= start % mmap.PAGESIZE
+            mm.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+    span = _report_span(mm, div_ids, release)
+    if span is None:
+        mm.close()
+        f.close()
+        return None
+    release(len(mm))
+
+    def rows():
+        try:
+            if _backend("lxml") is not None:
+                yield from _stream_rows_lxml(mm, span, chunk_size, release)
+            else:
+                yield from _stream_rows_stdlib(_chunks(mm, *span, chunk_size, release))
+        finally:
+            mm.close()
+            f.close()
+
+    return rows()
+
+# ================= PUBLIC API =================
+
+def available_engines():
+    """Names of the engines whose backing library is installed, fastest first (imports them all)."""
+    return [name for name in ENGINE_ORDER if _backend(name) is not None]
+
+
+def default_engine():
+    if os.environ.get(ENGINE_ENV):
+        return os.environ[ENGINE_ENV]
+    # Only imports engines up to the first one installed
+    for name in ENGINE_ORDER:
+        if _backend(name) is not None:
+            return name
+    raise RuntimeError("❌ No HTML parser installed (selectolax, lxml or bs4).")
+
+
+def preload(engine=None):
+    """Imports the engine extract() will use now, e.g. from a background thread at startup."""
+    _backend(engine or default_engine())
+
+
+def iter_report_rows(html, div_ids=REPORT_DIV_IDS, engine=None):
+    """
+    Returns an iterator of per-<tr> cell text lists from the report div, or
+    None if no div id matches. Rows without direct <td> children are skipped.
+    """
+    name = engine or default_engine()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown parser engine: {name!r}")
+    if _backend(name) is None:
+        raise RuntimeError(f"❌ Parser engine {name!r} is not installed.")
+    return ENGINES[name](html, div_ids)
+
+# ================= ROW WALK =================
+
+USERNAME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9]*$")
+TIMESTAMP_RE = re.compile(
+    r"\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}:\d{2}\s+[AP]M"
+)
+TASK_LIST_RE = re.compile(r"(MQI-\d+)|(DA-\d+.*MQI-\d+)")
+
+# Report header labels. Once the header row is seen, data rows are read by
+# column position instead of classifying every cell (see iter_pass_rows).
+HEADER_LABELS = {
+    "Task List": "task_list",
+    "Employee": "employee",
+    "Task Item": "task_item",
+    "Status": "status",
+    "Txn Date": "txn_date",
+}
+
+
+def is_task_list(text):
+    return bool(TASK_LIST_RE.match(text))
+
+
+def is_timestamp(text):
+    return bool(TIMESTAMP_RE.fullmatch(text))
+
+
+def header_layout(texts):
+    """
+    (row width, task list, employee, task item, status, txn date column) if
+    texts is the report header row, else None.
+    """
+    columns = {}
+    for i, t in enumerate(texts):
+        field = HEADER_LABELS.get(t)
+        if field:
+            columns[field] = i
+    if len(columns) != len(HEADER_LABELS):
+        return None
+    return (len(texts), columns["task_list"], columns["employee"],
+            columns["task_item"], columns["status"], columns["txn_date"])
+
+
+def iter_pass_rows(cells, warn=False):
+    """
+    Yields the PASS Row records of per-row cell text lists (from any source,
+    in any chunking: the rowspan'd task list / employee carry over).
+
+    Fast path: after the header row, a data row is read by position. A row with
+    k cells fewer than the header is missing its first k columns (task list /
+    employee rowspan'd from an earlier row), which come from the carried state.
+    Rows that don't fit the layout fall back to the per-cell heuristics.
+    warn: print a warning for PASS rows dropped for a missing task list / employee.
+    """
+    state = {
+        "task_list": None,
+        "employee": None,
+    }
+    layout = None
+    match_ts = TIMESTAMP_RE.fullmatch
+    intern = sys.intern
+
+    def missing(task_list, txn_date):
+        if not warn:
+            return
+        if not task_list:
+            print(f"⚠️ Missing task list at {txn_date}")
+        else:
+            print(f"⚠️ Missing employee for {task_list} at {txn_date}")
+
+    for texts in cells:
+        if layout is not None:
+            carried = width - len(texts)
+            if 0 <= carried <= max_carried:
+                status = texts[status_col - carried]
+                txn_date = texts[ts_col - carried]
+                task_list = texts[tl_col - carried] if tl_col >= carried else state["task_list"]
+                employee = texts[emp_col - carried] if emp_col >= carried else state["employee"]
+                if (
+                    (status == "PASS" or status == "FAIL")
+                    and match_ts(txn_date)
+                    # New group cells are validated once per group, not per row
+                    and (task_list is state["task_list"] or is_task_list(task_list))
+                    and (employee is state["employee"] or USERNAME_RE.fullmatch(employee))
+                ):
+                    if task_list is not state["task_list"]:
+                        task_list = state["task_list"] = intern(task_list)
+                    if employee is not state["employee"]:
+                        employee = state["employee"] = intern(employee)
+                    if status == "PASS":
+                        if task_list and employee:
+                            yield Row(task_list, employee, intern(texts[item_col - carried]), txn_date)
+                        else:
+                            missing(task_list, txn_date)
+                    continue
+
+        txn_date = next((t for t in texts if is_timestamp(t)), None)
+        if not txn_date:
+            # Header rows carry no timestamp; SSRS may repeat them on every page
+            layout = header_layout(texts) or layout
+            if layout is not None:
+                width, tl_col, emp_col, item_col, status_col, ts_col = layout
+                max_carried = min(item_col, status_col, ts_col)
+            continue
+
+        # ---- Resolve task list + employee (rowspan safe) ----
+        seen_pass = False
+        for t in texts:
+            if t in ("PASS", "FAIL"):
+                seen_pass = True
+                continue
+
+            if is_task_list(t):
+                state["task_list"] = intern(t)
+                continue
+
+            if (
+                not seen_pass
+                and USERNAME_RE.fullmatch(t)
+            ):
+                state["employee"] = intern(t)
+
+        # ---- Task item + status are adjacent ----
+        task_item = None
+        status = None
+        for i in range(len(texts) - 1):
+            if texts[i + 1] in ("PASS", "FAIL"):
+                task_item = texts[i]
+                status = texts[i + 1]
+                break
+
+        if status != "PASS":
+            continue
+
+        if not state["task_list"] or not state["employee"]:
+            missing(state["task_list"], txn_date)
+            continue
+
+        yield Row(state["task_list"], state["employee"], intern(task_item), txn_date)
@@ -0,0 +1,113 @@
+"""
+Local stand-in for the SSRS ReportServer, serving recorded responses so the
+HTTP fetch engine (report_http.py) can be run and tested offline.
+
+Responses are looked up as <responses_dir>/<container>.<ext>, falling back to
+default.<ext>, where <ext> follows the requested rs:Format (csv, xml, html).
+A single page (rc:Section=N) is served from <container>.p<N>.<ext> or
+default.p<N>.<ext> if present. Record them with
+ReportHTTPClient(record_dir=...) against the real server.
+
+    python report_stub_server.py recorded/ --port 8765
+    python report_stub_server.py recorded/ --delay 0.2      # simulated render time per request
+    DHR_REPORT_SERVER=http://127.0.0.1:8765/ReportServer python reporting_app.py
+"""
+import argparse
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from report_http import PARAM_CONTAINER, RENDER_FORMATS
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xml": "text/xml; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+}
+
+
+class StubReportHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real server
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query, keep_blank_values=True)
+        fmt = query.get("rs:Format", ["HTML4.0"])[0]
+        ext = RENDER_FORMATS.get(fmt)
+        container = query.get(PARAM_CONTAINER, [""])[0]
+        section = query.get("rc:Section", ["0"])[0]
+        if ext is None:
+            return self._send(400, f"Unsupported rs:Format {fmt!r}")
+
+        self.server.requests_served += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        names = [f"{container}.{ext}", f"default.{ext}"]
+        if section not in ("", "0"):
+            names = [f"{container}.p{section}.{ext}", f"default.p{section}.{ext}"] + names
+        for name in names:
+            path = os.path.join(self.server.responses_dir, os.path.basename(name))
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    return self._send(200, f.read(), CONTENT_TYPES[ext])
+        self._send(404, f"No recorded response for container {container!r} ({fmt})")
+
+    def _send(self, code, body, content_type="text/plain; charset=utf-8"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StubReportServer(ThreadingHTTPServer):
+    """Threaded stub server; start() serves in the background until stop()."""
+    daemon_threads = True
+
+    def __init__(self, responses_dir, host="127.0.0.1", port=0, verbose=False, delay=0):
+        super().__init__((host, port), StubReportHandler)
+        self.responses_dir = responses_dir
+        self.verbose = verbose
+        # Seconds each response is held back, standing in for the server's render time
+        self.delay = delay
+        self.requests_served = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/ReportServer"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded DHR report responses.")
+    parser.add_argument("responses_dir")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0, help="seconds to hold back every response")
+    args = parser.parse_args()
+
+    server = StubReportServer(args.responses_dir, args.host, args.port, verbose=True, delay=args.delay)
+    print(f"Serving {args.responses_dir} at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,3 +1,4 @@
+import os
 import sys
 import warnings
 # Filter warnings generated by certain selenium/bs4 interactions
@@ -8,37 +9,46 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QStackedWidget, QGraphicsView,
-    QGraphicsScene, QMessageBox
+    QGraphicsScene, QMessageBox, QComboBox, QShortcut
 )
-from PyQt5.QtCore import Qt, QPointF, QRectF, QThread, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, QPointF, QRectF, QThread, QObject, pyqtSignal, QTimer
 from PyQt5.QtGui import (
-    QPen, QBrush, QColor, QPolygonF, QFont, QPainter, QPainterPath, QResizeEvent
+    QPen, QBrush, QColor, QPolygonF, QFont, QPainter, QPainterPath, QResizeEvent, QKeySequence
 )
 
 # Core Imports
-from seleniumbase import SB
 import time
 import random
+import threading
+import importlib
+import hashlib
+import itertools
+import json
+import sqlite3
 from datetime import datetime
 from urllib.parse import urlsplit
-from bs4 import BeautifulSoup
-from collections import defaultdict
 import re
+from report_parser import HEADER_LABELS, Row, iter_pass_rows, iter_report_rows, report_fingerprint, preload as preload_parser
+from report_http import ReportHTTPClient, REPORT_SERVER_URL, REPORT_PATH, iter_export_cells
+from shifts import ShiftClassifier, shift_times_from_env
+from history_store import DEFAULT_DB_PATH as HISTORY_DEFAULT_DB, HistoryStore
+from cycle_metrics import StageMetrics
+from pipeline import ParseStage
+from browser_session import SessionManager, browser_mode_from_env, profile_dir_from_env
+from snapshot_archive import ArchiveWriter, iter_archive
+from station_delta import StationTracker, apply_changes, diff_views
 # Removed: import json, import csv
 
 # ==============================================================================
-# 1. DATA PARSING & LOGIC (BeautifulSoup Pipeline)
+# 1. DATA PARSING & LOGIC (report_parser engines: selectolax / lxml / BS4)
 # ==============================================================================
 
-SHIFT_TIMES = {
+SHIFT_TIMES = shift_times_from_env({
     "day":   ("8:00 AM",  "2:40 PM"),
     "swing": ("3:00 PM", "11:20 PM"),
-}
-
-USERNAME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9]*$")
-TIMESTAMP_RE = re.compile(
-    r"\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}:\d{2}\s+[AP]M"
-)
+})
+# Compiled once: O(1) lookup per row, overnight shifts supported
+SHIFTS = ShiftClassifier(SHIFT_TIMES)
 
 def parse_ts(ts):
     return datetime.strptime(ts, "%m/%d/%Y %I:%M:%S %p")
@@ -46,286 +56,1360 @@ def parse_ts(ts):
 def get_shift(ts):
     """Determines the shift based on the timestamp."""
     try:
-        ts_dt = parse_ts(ts)
-        t = ts_dt.time()
+        return SHIFTS.classify(ts)
     except ValueError:
         return None
 
-    for shift, (start_str, end_str) in SHIFT_TIMES.items():
-        start_t = datetime.strptime(start_str, "%I:%M %p").time()
-        end_t = datetime.strptime(end_str, "%I:%M %p").time()
-
-        if start_t <= end_t:
-            if start_t <= t <= end_t:
-                return shift
-        else:
-            if start_t <= t or t <= end_t:
-                return shift
-    return None
-
-def is_task_list(text):
-    return bool(re.match(r"(MQI-\d+)|(DA-\d+.*MQI-\d+)", text))
-
-def is_timestamp(text):
-    return bool(TIMESTAMP_RE.fullmatch(text))
+# Report content div ids, tried in order (classic oReportDiv, then the ReportArea wrapper)
+REPORT_DIV_IDS = (
+    "oReportDiv",
+    "ReportViewerControl_ctl09_ReportArea_ReportViewerControl_ctl09_ReportArea",
+)
 
-def extract(html):
-    """Extracts raw data rows from the SSRS report HTML using BS4."""
-    soup = BeautifulSoup(html, "html.parser")
-    # Find the report content div
-    report = soup.find("div", id=lambda x: x and "oReportDiv" in x)
-    
-    if not report:
-        report = soup.find("div", id=re.compile(r"ReportViewerControl_ctl09_ReportArea_ReportViewerControl_ctl09_ReportArea"))
-        if not report:
-             raise RuntimeError("❌ Report content div not found in HTML (oReportDiv or ReportArea missing).")
-
-    rows = []
-    state = {
-        "task_list": None,
-        "employee": None,
+def extract(html, engine=None):
+    """Extracts raw data rows from the SSRS report HTML (see report_parser for engines)."""
+    report = iter_report_rows(html, REPORT_DIV_IDS, engine)
+    if report is None:
+        raise RuntimeError("❌ Report content div not found in HTML (oReportDiv or ReportArea missing).")
+
+    return walk_rows(report)
+
+def walk_rows(cells):
+    """Turns per-row cell text lists (from any source) into Row records (report_parser.iter_pass_rows)."""
+    return list(iter_pass_rows(cells))
+
+# Persistent row history (see history_store.py); set DHR_HISTORY_DB="" to disable
+HISTORY_DB = os.environ.get("DHR_HISTORY_DB", HISTORY_DEFAULT_DB)
+HISTORY_RETENTION_DAYS = 90
+
+# Same row-walking logic as extract(), run inside the browser so only the compact
+# [task_list, employee, task_item, txn_date] rows cross the WebDriver wire.
+# arguments[0] = REPORT_DIV_IDS, arguments[1] = HEADER_LABELS. Returns null if no
+# report div is reachable (searched in the current document, then in same-origin iframes).
+EXTRACT_ROWS_JS = r"""
+var ids = arguments[0];
+var labels = arguments[1];
+var TIMESTAMP = /^\d{1,2}\/\d{1,2}\/\d{4}\s+\d{1,2}:\d{2}:\d{2}\s+[AP]M$/;
+var TASK_LIST = /^(?:MQI-\d+|DA-\d+.*MQI-\d+)/;
+var USERNAME = /^[A-Za-z][A-Za-z0-9]*$/;
+
+function findIn(doc, id) {
+    var div = doc.querySelector('div[id*="' + id + '"]');
+    if (div) return div;
+    var frames = doc.getElementsByTagName('iframe');
+    for (var i = 0; i < frames.length; i++) {
+        var inner = null;
+        try { inner = frames[i].contentDocument; } catch (e) {}
+        var found = inner ? findIn(inner, id) : null;
+        if (found) return found;
     }
+    return null;
+}
 
-    for tr in report.find_all("tr"):
-        tds = tr.find_all("td", recursive=False)
-        if not tds:
-            continue
-
-        texts = [td.get_text(strip=True) for td in tds]
-
-        txn_date = next((t for t in texts if is_timestamp(t)), None)
-        if not txn_date:
-            continue
-
-        # ---- Resolve task list + employee (rowspan safe) ----
-        seen_pass = False
-        for t in texts:
-            if t in ("PASS", "FAIL"):
-                seen_pass = True
-                continue
-
-            if is_task_list(t):
-                state["task_list"] = t
-                continue
+function cellText(td) {
+    // bs4 get_text(strip=True): every text node trimmed, joined with ""
+    var walker = td.ownerDocument.createTreeWalker(td, 4 /* SHOW_TEXT */);
+    var out = "";
+    while (walker.nextNode()) out += walker.currentNode.nodeValue.trim();
+    return out;
+}
 
-            if (
-                not seen_pass
-                and USERNAME_RE.fullmatch(t)
-            ):
-                state["employee"] = t
+var report = null;
+for (var k = 0; k < ids.length && !report; k++) report = findIn(document, ids[k]);
+if (!report) return null;
+
+function headerLayout(texts) {
+    var cols = {}, found = 0;
+    for (var i = 0; i < texts.length; i++) {
+        if (!Object.prototype.hasOwnProperty.call(labels, texts[i])) continue;
+        var field = labels[texts[i]];
+        if (!(field in cols)) found++;
+        cols[field] = i;
+    }
+    if (found !== Object.keys(labels).length) return null;
+    cols.width = texts.length;
+    return cols;
+}
 
-        # ---- Task item + status are adjacent ----
-        task_item = None
-        status = None
-        for i in range(len(texts) - 1):
-            if texts[i + 1] in ("PASS", "FAIL"):
-                task_item = texts[i]
-                status = texts[i + 1]
-                break
+var rows = [];
+var taskList = null, employee = null, layout = null;
+var trs = report.getElementsByTagName('tr');
+for (var r = 0; r < trs.length; r++) {
+    var texts = [];
+    for (var c = trs[r].firstElementChild; c; c = c.nextElementSibling) {
+        if (c.localName === 'td') texts.push(cellText(c));
+    }
 
-        if status != "PASS":
-            continue
+    // Positional fast path once the header row fixed the column layout
+    if (layout) {
+        var k = layout.width - texts.length;
+        if (k >= 0 && k <= Math.min(layout.task_item, layout.status, layout.txn_date)) {
+            var st = texts[layout.status - k], ts = texts[layout.txn_date - k];
+            var tl = layout.task_list >= k ? texts[layout.task_list - k] : taskList;
+            var emp = layout.employee >= k ? texts[layout.employee - k] : employee;
+            if ((st === 'PASS' || st === 'FAIL') && TIMESTAMP.test(ts)
+                    && (layout.task_list < k || TASK_LIST.test(tl))
+                    && (layout.employee < k || USERNAME.test(emp))) {
+                taskList = tl;
+                employee = emp;
+                if (st === 'PASS' && taskList && employee) {
+                    rows.push([taskList, employee, texts[layout.task_item - k], ts]);
+                }
+                continue;
+            }
+        }
+    }
 
-        if not state["task_list"] or not state["employee"]:
-            continue
+    var txnDate = null;
+    for (var i = 0; i < texts.length; i++) {
+        if (TIMESTAMP.test(texts[i])) { txnDate = texts[i]; break; }
+    }
+    if (!txnDate) {
+        layout = headerLayout(texts) || layout;
+        continue;
+    }
 
-        rows.append({
-            "task_list": state["task_list"],
-            "employee": state["employee"],
-            "task_item": task_item,
-            "txn_date": txn_date,
-        })
+    var seenPass = false;
+    for (var i = 0; i < texts.length; i++) {
+        var t = texts[i];
+        if (t === 'PASS' || t === 'FAIL') { seenPass = true; continue; }
+        if (TASK_LIST.test(t)) { taskList = t; continue; }
+        if (!seenPass && USERNAME.test(t)) employee = t;
+    }
 
-    return rows
+    var taskItem = null, status = null;
+    for (var i = 0; i < texts.length - 1; i++) {
+        if (texts[i + 1] === 'PASS' || texts[i + 1] === 'FAIL') {
+            taskItem = texts[i];
+            status = texts[i + 1];
+            break;
+        }
+    }
+    if (status !== 'PASS' || !taskList || !employee) continue;
+    rows.push([taskList, employee, taskItem, txnDate]);
+}
+return rows;
+"""
+
+def extract_in_browser(sb):
+    """
+    Runs EXTRACT_ROWS_JS in the live page and returns the same Row records as
+    extract(), or None if the report div could not be reached from the page.
+    """
+    compact = sb.execute_script(EXTRACT_ROWS_JS, list(REPORT_DIV_IDS), HEADER_LABELS)
+    if compact is None:
+        return None
+    intern = sys.intern
+    return [Row(intern(tl), intern(emp), intern(item), ts) for tl, emp, item, ts in compact]
 
 def organize(rows):
     """Groups the extracted rows by task list and shift, preparing for the GUI."""
-    data = defaultdict(lambda: {
-        "day": {"employee": "", "employees": set(), "tasks": set()},
-        "swing": {"employee": "", "employees": set(), "tasks": set()}
-    })
+    names = SHIFTS.names
+    # task_list -> shift -> [first employee, set of passed task items]
+    data = {}
 
-    for r in rows:
-        shift = get_shift(r["txn_date"])
+    for task_list, employee, task_item, txn_date in rows:
+        shift = get_shift(txn_date)
         if not shift: continue
 
-        entry = data[r["task_list"]][shift]
+        shifts = data.get(task_list)
+        if shifts is None:
+            shifts = data[task_list] = {s: ["", set()] for s in names}
+        entry = shifts[shift]
 
-        if not entry["employee"]:
-            entry["employee"] = r["employee"]
-        entry["employees"].add(r["employee"])
-        entry["tasks"].add(r["task_item"])
+        if not entry[0]:
+            entry[0] = employee
+        entry[1].add(task_item)
 
     result = []
     for task_list, shifts in sorted(data.items()):
-        out = {task_list: {}}
-        for s in ("day", "swing"):
-            out[task_list][s] = {
-                "employee": shifts[s]["employee"],
-                # Convert set back to list for JSON/PyQt signal transfer safety
-                "task_completed": list(sorted(shifts[s]["tasks"])), 
-                "total_passed": len(shifts[s]["tasks"]),
-            }
-        result.append(out)
+        result.append({task_list: {
+            # Tuples, not sets: safe for the PyQt signal and for JSON
+            s: {"employee": employee, "task_completed": tuple(sorted(tasks)), "total_passed": len(tasks)}
+            for s, (employee, tasks) in shifts.items()
+        }})
 
     return result
 
+# Render format of a multi-page report as one body (see pages_body)
+PAGES_FORMAT = "pages"
+
+def pages_body(bodies, render_format):
+    """All pages of a report as one body to fingerprint, archive and parse: JSON {"format", "pages"}."""
+    return json.dumps({"format": render_format, "pages": bodies})
+
+def extract_rows(body, render_format="page"):
+    """
+    Rows of the ReportViewer page source ("page"), of an HTTP render
+    (report_http formats) or of a pages_body() (PAGES_FORMAT).
+    """
+    if render_format == "page":
+        return extract(body)
+    if render_format == PAGES_FORMAT:
+        pages = json.loads(body)
+        return rows_from_pages(page_cells(page, pages["format"]) for page in pages["pages"])
+    return walk_rows(iter_export_cells(body, render_format, REPORT_DIV_IDS))
+
+def page_cells(body, render_format="HTML4.0"):
+    """
+    Per-row cell texts of one report page: an HTML4.0 render (fetch_pages()
+    parse step, run as each page arrives) or a viewer page source ("page").
+    """
+    if render_format == "page":
+        cells = iter_report_rows(body, REPORT_DIV_IDS)
+        if cells is None:
+            raise RuntimeError("❌ Report content div not found in a report page.")
+        return list(cells)
+    return list(iter_export_cells(body, render_format, REPORT_DIV_IDS))
+
+def rows_from_pages(pages):
+    """
+    Rows of a multi-page report from its pages' cell lists, walked in page
+    order as one table: the header layout and rowspan'd task list/employee
+    carry across page breaks.
+    """
+    return walk_rows(itertools.chain.from_iterable(pages))
+
+def parse_report(body, render_format="page"):
+    """Parse stage body, run in the parse worker process: page or render -> (rows, organized)."""
+    rows = extract_rows(body, render_format)
+    return rows, organize(rows)
+
+def rows_fingerprint(rows):
+    """Order-sensitive key of the extracted rows; equal keys organize() identically."""
+    return hash(tuple(rows))
+
+# Stage timings of every refresh cycle and GUI apply, shared by all monitor threads.
+# DHR_METRICS_FILE=<path> dumps them after each cycle (.prom: Prometheus textfile, else JSON)
+METRICS = StageMetrics()
+METRICS_FILE = os.environ.get("DHR_METRICS_FILE", "")
+# Show the stage timing overlay on the monitoring screen at start (F3 toggles it)
+METRICS_OVERLAY = os.environ.get("DHR_METRICS_OVERLAY") == "1"
+
+def dump_metrics():
+    if METRICS_FILE:
+        try:
+            METRICS.dump(METRICS_FILE)
+        except OSError as e:
+            print(f"⚠️ Could not write metrics to {METRICS_FILE}: {e}")
+
+# DHR_RECORD_ARCHIVE=<path> appends every fetched page to a snapshot archive
+# that the "replay" fetch engine can play back (see snapshot_archive.py)
+RECORD_ARCHIVE = os.environ.get("DHR_RECORD_ARCHIVE", "")
+
+_archive = None
+
+def open_archive():
+    """Shared ArchiveWriter for all monitor threads (None unless recording)."""
+    global _archive
+    if _archive is None and RECORD_ARCHIVE and FETCH_ENGINE != "replay":
+        _archive = ArchiveWriter(RECORD_ARCHIVE)
+    return _archive
+
+_history = None
+_history_lock = threading.Lock()
+
+def open_history(maintain=False):
+    """
+    Shared HistoryStore for all monitor threads, opened on first use (None if
+    DHR_HISTORY_DB is empty). maintain: also apply retention (purge + VACUUM),
+    so call it from a monitor thread. Raises sqlite3.Error / OSError.
+    """
+    global _history
+    if not HISTORY_DB:
+        return None
+    with _history_lock:
+        if _history is None:
+            os.makedirs(os.path.dirname(os.path.abspath(HISTORY_DB)), exist_ok=True)
+            _history = HistoryStore(HISTORY_DB)
+            maintain = True
+        if maintain:
+            _history.maintain(HISTORY_RETENTION_DAYS)
+        return _history
+
+# Render formats whose body wraps the report div in page chrome (view state,
+# timestamps): only the div is fingerprinted. Other bodies are hashed whole.
+REGION_FORMATS = ("page", "HTML4.0")
+
+def body_fingerprint(body, render_format="page"):
+    """Content hash of what changed_html() compares, or None if the report div can't be located."""
+    if render_format in REGION_FORMATS:
+        return report_fingerprint(body, REPORT_DIV_IDS)
+    if render_format == PAGES_FORMAT:
+        pages = json.loads(body)
+        if pages["format"] in REGION_FORMATS:
+            keys = [report_fingerprint(page, REPORT_DIV_IDS) for page in pages["pages"]]
+            return None if None in keys else "/".join(keys)
+    # CSV/XML: nothing but the report in the body
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+class ChangeDetector:
+    """
+    Short-circuits extract() -> organize() -> emit -> repaint for refresh cycles
+    whose report is unchanged. Two levels: a hash of the raw report div (skips
+    parsing too) and a key of the extracted rows (catches re-rendered but
+    identical reports). Counters are kept in self.stats.
+    """
+    def __init__(self, history=None, container=None, archive=None):
+        self.stats = {"cycles": 0, "skipped_html": 0, "skipped_rows": 0}
+        self._fingerprint = None
+        self._rows_key = None
+        # Changed row sets are appended to this HistoryStore (deduplicated there)
+        self.history = history
+        self.container = container
+        # Every page seen by changed_html() is recorded to this ArchiveWriter
+        self.archive = archive
+        # Station view last sent to the GUI (see station_changes)
+        self.stations = StationTracker()
+
+    def changed_html(self, html, render_format="page"):
+        """Counts a cycle; False if the report div is byte-identical to the last one seen."""
+        self.stats["cycles"] += 1
+        with METRICS.stage("fingerprint"):
+            fingerprint = body_fingerprint(html, render_format)
+        changed = fingerprint is None or fingerprint != self._fingerprint
+        if self.archive is not None:
+            with METRICS.stage("record"):
+                self.archive.record(self.container, render_format, html if changed else None)
+        if not changed:
+            self.stats["skipped_html"] += 1
+            return False
+        self._fingerprint = fingerprint
+        return True
+
+    def process_html(self, html, render_format="page"):
+        """Returns the organized data, or None if nothing changed since the last cycle."""
+        if not self.changed_html(html, render_format):
+            return None
+        try:
+            with METRICS.stage("extract"):
+                rows = extract_rows(html, render_format)
+        except Exception:
+            self.forget()
+            raise
+        return self._organize_if_changed(rows)
+
+    def forget(self):
+        """Drops the last fingerprint, e.g. when that body failed to parse, so the next one is parsed again."""
+        self._fingerprint = None
+
+    def count_cycle(self):
+        self.stats["cycles"] += 1
+
+    def process_rows(self, rows):
+        """Same as process_html() for rows that were already extracted."""
+        self.count_cycle()
+        return self._organize_if_changed(rows)
+
+    def process_parsed(self, rows, organized=None):
+        """
+        Row-level check for a parse_report() result whose HTML already passed
+        changed_html(), or for rows queued after count_cycle() (organized None).
+        """
+        return self._organize_if_changed(rows, organized)
+
+    def _organize_if_changed(self, rows, organized=None):
+        rows_key = rows_fingerprint(rows)
+        if rows_key == self._rows_key:
+            self.stats["skipped_rows"] += 1
+            return None
+        self._rows_key = rows_key
+        if self.history is not None:
+            with METRICS.stage("history"):
+                try:
+                    self.history.ingest(self.container, rows)
+                except sqlite3.Error as e:
+                    print(f"⚠️ [{self.container}] Row history disabled: {e}")
+                    self.history = None
+        if organized is not None:
+            return organized
+        with METRICS.stage("organize"):
+            return organize(rows)
+
+    def station_changes(self, organized):
+        """
+        Numbered batch of per-station changes (station_delta) since the last
+        organized data passed here, or None. Call from one thread at a time.
+        """
+        with METRICS.stage("diff"):
+            return self.stations.update(station_views(organized))
+
+    def summary(self):
+        skipped = self.stats["skipped_html"] + self.stats["skipped_rows"]
+        return f"skipped {skipped}/{self.stats['cycles']} unchanged cycles"
+
 # ==============================================================================
 # 2. SELENIUM THREAD (Data Getter and Refresh Loop)
 # ==============================================================================
 
 REPORT_URL = "https://reporting.penumbrainc.com/Reports/report/MES%20General/DHR%20Report%20-%20Mfg"
 
-def switch_into_report_iframe(sb, timeout=30):
-    """Switches the Selenium context to the main report iframe."""
-    sb.switch_to_default_content()
-    try:
-        sb.wait_for_element('iframe', timeout=timeout)
-    except:
+# Walk the report rows inside the browser (EXTRACT_ROWS_JS) instead of pulling the
+# whole page source; falls back to get_page_source() + extract() if that fails.
+EXTRACT_IN_BROWSER = True
+
+# "selenium" drives Chrome through the ReportViewer; "http" renders the report
+# directly from the ReportServer (see report_http.py), no browser needed;
+# "replay" plays back DHR_REPLAY_ARCHIVE (recorded with DHR_RECORD_ARCHIVE).
+FETCH_ENGINE = os.environ.get("DHR_FETCH_ENGINE", "selenium")
+
+# Replay pacing: 1 = recorded speed, 10 = ten times faster, 0 = as fast as possible
+REPLAY_ARCHIVE = os.environ.get("DHR_REPLAY_ARCHIVE", "")
+REPLAY_SPEED = float(os.environ.get("DHR_REPLAY_SPEED", "1"))
+
+# Page sources and HTTP renders are parsed + organized by a separate stage in a
+# worker process (pipeline.py), keeping only the newest unparsed snapshot.
+# DHR_PARSE_PROCESS=0 keeps that stage in a thread of this process instead.
+PARSE_IN_PROCESS = os.environ.get("DHR_PARSE_PROCESS", "1") != "0"
+
+# read_report() result when the page was handed to the parse stage
+PARSE_QUEUED = object()
+
+# The scraping stack is not needed to show the login screen: it is imported in
+# a background thread once the window is up (seleniumbase alone is ~0.5 s)
+BACKGROUND_IMPORTS = ("seleniumbase", "requests")
+BACKGROUND_IMPORT_DELAY_MS = 200
+
+def preload_scraping_stack():
+    """Starts importing the heavy modules off the GUI thread; returns the thread."""
+    def load():
+        started = time.perf_counter()
+        for name in BACKGROUND_IMPORTS:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                print(f"⚠️ Background import of {name} failed: {e}")
+        preload_parser()
+        print(f"[startup] scraping stack imported in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    thread = threading.Thread(target=load, name="preload", daemon=True)
+    thread.start()
+    return thread
+
+# Browsers outlive monitor threads: Stop/Start, restarts and container switches
+# reuse the logged-in session with the report loaded (see browser_session.py).
+# DHR_BROWSER_MODE=lean: headless, no images/fonts/media, extensions and GPU off
+SESSIONS = SessionManager(profile_dir_from_env(), browser_mode_from_env())
+
+# Multi-container mode: max concurrent browser/HTTP sessions, and the pause
+# each worker takes between two container fetches
+POOL_SIZE = int(os.environ.get("DHR_POOL_SIZE", "3"))
+POOL_PAUSE_SECONDS = 2
+
+# Upper bounds for the readiness waits (they return as soon as the condition holds)
+NAV_TIMEOUT = 15
+REPORT_TIMEOUT = 60
+ELEMENT_TIMEOUT = 10
+
+# Stop never blocks the GUI: every wait of a monitor thread wakes on its cancel
+# event. A browser/HTTP call still running STOP_GRACE_SECONDS after Stop is cut
+# short by quitting that browser from a teardown thread. On exit, stopping
+# threads get EXIT_TIMEOUT_SECONDS to finish before the browsers are quit.
+STOP_GRACE_SECONDS = 2
+EXIT_TIMEOUT_SECONDS = 30
+
+IFRAME_SELECTORS = [
+    'iframe[id^="ReportViewerControl"]',
+    'iframe[name^="ReportViewerControl"]',
+    'iframe#ReportViewerControl_IFrame',
+    "iframe",
+]
+PARAM_INPUT = 'input[name^="ReportViewerControl$ctl04"]'
+
+# Prelude of the ReportViewer scripts below: docs = the top document and every
+# same-origin iframe document under it, so a script works from any frame.
+REPORT_FRAMES_JS = r"""
+var docs = [];
+function collect(doc) {
+    docs.push(doc);
+    var frames = doc.getElementsByTagName('iframe');
+    for (var i = 0; i < frames.length; i++) {
+        try { if (frames[i].contentDocument) collect(frames[i].contentDocument); } catch (e) {}
+    }
+}
+var root = document;
+try { root = window.top.document; } catch (e) {}
+collect(root);
+"""
+
+# report = the report div in any of docs, or null. arguments[0] = REPORT_DIV_IDS.
+FIND_REPORT_JS = r"""
+var ids = arguments[0], report = null;
+for (var k = 0; k < ids.length && !report; k++) {
+    for (var d = 0; d < docs.length && !report; d++) {
+        report = docs[d].querySelector('div[id*="' + ids[k] + '"]');
+    }
+}
+"""
+
+# Readiness of the ReportViewer. Returns [busy, row_count, marked]: busy = an
+# ASP.NET async postback is running or the AsyncWait spinner is visible;
+# row_count = <tr>s in the report div (-1 if absent); marked = the div still
+# carries the MARK_REPORT_JS marker (not re-rendered).
+REPORT_STATE_JS = REPORT_FRAMES_JS + FIND_REPORT_JS + r"""
+var busy = false;
+for (var d = 0; d < docs.length; d++) {
+    var win = docs[d].defaultView;
+    try {
+        var prm = win.Sys && win.Sys.WebForms && win.Sys.WebForms.PageRequestManager.getInstance();
+        if (prm && prm.get_isInAsyncPostBack()) busy = true;
+    } catch (e) {}
+    var spinner = docs[d].querySelector('[id$="AsyncWait_Wait"]');
+    if (spinner && spinner.offsetParent !== null) busy = true;
+}
+if (!report) return [busy, -1, false];
+return [busy, report.getElementsByTagName('tr').length, report.hasAttribute('data-dhr-seen')];
+"""
+
+# Page count of the ReportViewer toolbar: [total, estimated] (estimated: SSRS
+# shows "N?" until it has paginated the whole report), or null if there is no
+# page navigation.
+REPORT_PAGES_JS = REPORT_FRAMES_JS + r"""
+for (var d = 0; d < docs.length; d++) {
+    var total = docs[d].querySelector('[id$="_TotalPages"]');
+    if (!total) continue;
+    var m = /^(\d+)\s*(\?)?$/.exec((total.textContent || total.value || '').trim());
+    if (m) return [parseInt(m[1], 10), !!m[2]];
+}
+return null;
+"""
+
+# Tags the current report div so a re-render (which replaces it) can be detected.
+MARK_REPORT_JS = REPORT_FRAMES_JS + FIND_REPORT_JS + r"""
+if (!report) return false;
+report.setAttribute('data-dhr-seen', '1');
+return true;
+"""
+
+# Clicks the viewer toolbar's page button arguments[0] ("First" or "Next");
+# false if it is missing, hidden or disabled (already on the first/last page).
+VIEWER_PAGE_JS = REPORT_FRAMES_JS + r"""
+for (var d = 0; d < docs.length; d++) {
+    var button = docs[d].querySelector('[id$="_' + arguments[0] + '_ctl00_ctl00"]');
+    if (!button) continue;
+    if (button.disabled || button.offsetParent === null) return false;
+    button.click();
+    return true;
+}
+return false;
+"""
+
+def wait_until(condition, timeout, poll=0.1, cancel=None):
+    """
+    Polls condition() until it returns something truthy; returns it, or None
+    on timeout or as soon as the cancel event (a threading.Event) is set.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = condition()
+        except Exception:
+            result = None  # mid-navigation: stale frames, JS not loaded yet, ...
+        if result:
+            return result
+        if time.monotonic() >= deadline:
+            return None
+        if cancel is None:
+            time.sleep(poll)
+        elif cancel.wait(poll):
+            return None
+
+def report_idle(sb):
+    """True once no async postback is running (spinner gone)."""
+    busy, _, _ = sb.execute_script(REPORT_STATE_JS, list(REPORT_DIV_IDS))
+    return not busy
+
+def report_rendered(sb, previous_rows=None):
+    """
+    True once the report div is present, idle and freshly rendered: the
+    MARK_REPORT_JS marker is gone or the row count differs from previous_rows.
+    """
+    busy, rows, marked = sb.execute_script(REPORT_STATE_JS, list(REPORT_DIV_IDS))
+    if busy or rows < 0:
         return False
+    return not marked or (previous_rows is not None and rows != previous_rows)
 
-    selectors = [
-        'iframe[id^="ReportViewerControl"]',
-        'iframe[name^="ReportViewerControl"]',
-        'iframe#ReportViewerControl_IFrame',
-        "iframe",
-    ]
-
-    for sel in selectors:
-        if sb.is_element_present(sel):
+def report_pages(sb):
+    """(total pages, estimated) of the report in the viewer, or (1, False) without page navigation."""
+    try:
+        pages = sb.execute_script(REPORT_PAGES_JS)
+    except Exception:
+        pages = None
+    return tuple(pages) if pages else (1, False)
+
+def switch_into_report_iframe(sb, timeout=30, preferred=None, cancel=None):
+    """
+    Switches the Selenium context to the main report iframe (the one holding the
+    parameter inputs). Tries the previously working selector first and polls until
+    timeout instead of sleeping. Returns the working selector, or None.
+    """
+    selectors = IFRAME_SELECTORS
+    if preferred:
+        selectors = [preferred] + [sel for sel in IFRAME_SELECTORS if sel != preferred]
+
+    def probe():
+        for sel in selectors:
+            sb.switch_to_default_content()
+            if not sb.is_element_present(sel):
+                continue
             try:
-                sb.switch_to_frame(sel)
-                if sb.is_element_present('input[name^="ReportViewerControl$ctl04"]'):
-                    return True
-            except:
+                sb.switch_to_frame(sel, timeout=1)
+                if sb.is_element_present(PARAM_INPUT):
+                    return sel
+            except Exception:
                 pass
-            sb.switch_to_default_content()
+        sb.switch_to_default_content()
+        return None
+
+    return wait_until(probe, timeout, poll=0.25, cancel=cancel)
+
+
+class MonitorStopped(Exception):
+    """Raised inside a monitor thread when a wait is cut short by stop()."""
+
+
+# Stopped monitor threads still running: referenced here so the QThread outlives
+# its screen, and waited for on exit (see shutdown)
+STOPPING = set()
 
-    return False
+def shutdown(timeout=EXIT_TIMEOUT_SECONDS):
+    """After the event loop: lets stopping monitor threads finish, then quits every browser."""
+    deadline = time.monotonic() + timeout
+    for thread in list(STOPPING):
+        thread.wait(max(0, int((deadline - time.monotonic()) * 1000)))
+    SESSIONS.close_all()
 
 
 class DHRMonitorThread(QThread):
     # Signals to communicate back to the GUI
     status_update = pyqtSignal(str)
     monitoring_stopped = pyqtSignal()
-    # Signal to send the organized list of dicts to the GUI
-    data_fetched = pyqtSignal(list)
+    # Signal to send numbered station batches (station_delta.StationBatch) to the GUI
+    stations_changed = pyqtSignal(object)
     
-    def __init__(self, container_num, username, password, parent=None):
+    def __init__(self, container_num, username, password, fetch_engine=None, parent=None):
         super().__init__(parent)
         self.container_num = container_num
         self.username = username
         self.password = password
-        self._is_running = True
+        self.fetch_engine = fetch_engine or FETCH_ENGINE
+        # Set by stop(); every sleep and wait in the thread wakes on it
+        self.cancel = threading.Event()
+        # Browser session / HTTP client in use, for the stop() teardown
+        self.session = None
+        self.client = None
+        # Multi-page reports: HTTP renders until one fails, then the viewer is paged (read_report)
+        self.pages_over_http = True
+        self.finished.connect(self.forget_stopped)
+        # History is attached on the thread itself (attach_history)
+        self.changes = ChangeDetector(None, container_num, open_archive())
+        # Cached working iframe selector and last measured latency per navigation step
+        self.iframe_selector = None
+        self.step_latency_ms = {}
+        # Parse+organize stage for page sources / HTTP bodies (single-container loops)
+        self.parse_stage = None
+        self.started_at = None
+
+    @property
+    def _is_running(self):
+        return not self.cancel.is_set()
 
     def stop(self):
-        self._is_running = False
-        self.wait(200) 
+        """
+        Returns at once: the thread's waits wake immediately and it exits at the
+        next check. A call still blocked after STOP_GRACE_SECONDS loses its browser.
+        """
+        if self.cancel.is_set():
+            return
+        self.cancel.set()
+        if self.isRunning():
+            STOPPING.add(self)
+            self.arm_teardown(first=True)
+            if not self.isRunning():    # finished before it was added
+                STOPPING.discard(self)
+
+    def arm_teardown(self, first=False):
+        teardown = threading.Timer(STOP_GRACE_SECONDS, self.force_stop, (first,))
+        teardown.daemon = True
+        teardown.start()
+
+    def force_stop(self, first=False):
+        """
+        Teardown thread: quits the browser (or closes the HTTP session) a stuck
+        call is waiting on, then re-arms until the thread has ended, so one
+        still starting (e.g. in SESSIONS.acquire) is torn down once it has one.
+        """
+        if not self.isRunning():
+            return
+        if first:
+            print(f"⚠️ Monitor thread still busy {STOP_GRACE_SECONDS} s after Stop; closing its browser/HTTP session.")
+        session, client = self.session, self.client
+        if session is not None:
+            session.quit()
+        if client is not None:
+            client.close()
+        self.arm_teardown()
+
+    def forget_stopped(self):
+        """finished slot (a bound method, so the connection holds no strong reference to the thread)."""
+        self.finished.disconnect(self.forget_stopped)
+        STOPPING.discard(self)
 
     def run(self):
-        sb = None
+        self.started_at = time.perf_counter()
         try:
-            # Set headless=False so the user sees the browser
-            sb = SB(browser="chrome", headless=False) 
-                
-            AUTH_URL = (
-                f"https://{self.username}:{self.password}@"
-                f"{urlsplit(REPORT_URL).netloc}"
-                f"{urlsplit(REPORT_URL).path}"
-            )
+            self.attach_history()
+            if self.fetch_engine == "http":
+                self.run_http()
+            elif self.fetch_engine == "replay":
+                self.run_replay()
+            else:
+                self.run_selenium()
+        except MonitorStopped:
+            pass
+        except Exception as e:
+            if self._is_running:    # else: the stop() teardown broke a blocked call
+                self.status_update.emit(f"MONITORING CRASHED: {e}")
+        finally:
+            self.monitoring_stopped.emit()
 
-            self.status_update.emit("Opening report URL and attempting login...")
-            sb.open(AUTH_URL)
-            time.sleep(3)
-            sb.open(REPORT_URL)
-            time.sleep(5)
+    def open_history(self):
+        """open_history() with retention, on this thread; None (history off for this run) on error."""
+        try:
+            return open_history(maintain=True)
+        except (sqlite3.Error, OSError) as e:
+            self.status_update.emit(f"⚠️ Row history disabled: could not open {HISTORY_DB} ({e}).")
+            return None
+
+    def attach_history(self):
+        self.changes.history = self.open_history()
+
+    def timed(self, step, fn, *args):
+        """Runs one navigation step, recording and logging its latency. Not started after stop()."""
+        self.check_stopped()
+        started = time.perf_counter()
+        result = fn(*args)
+        self.step_latency_ms[step] = (time.perf_counter() - started) * 1000
+        METRICS.record(f"nav {step}", self.step_latency_ms[step])
+        print(f"[nav] {step}: {self.step_latency_ms[step]:.0f} ms")
+        return result
+
+    def enter_report_iframe(self, sb, timeout=30):
+        """switch_into_report_iframe() with the working selector cached across calls."""
+        selector = switch_into_report_iframe(sb, timeout, self.iframe_selector, self.cancel)
+        self.check_stopped()
+        if selector:
+            self.iframe_selector = selector
+        return selector
+
+    def check_stopped(self):
+        if self.cancel.is_set():
+            raise MonitorStopped()
+
+    def wait_for(self, condition, timeout, poll=0.1):
+        """wait_until() that raises MonitorStopped when stop() cuts it short."""
+        result = wait_until(condition, timeout, poll, self.cancel)
+        self.check_stopped()
+        return result
+
+    def wait_for_element(self, sb, selector, timeout=ELEMENT_TIMEOUT):
+        """sb.wait_for_element() that stop() interrupts; TimeoutError if the element never shows."""
+        if not self.wait_for(lambda: sb.is_element_present(selector), timeout):
+            raise TimeoutError(f"Element {selector} not found after {timeout} s")
+
+    def start_parse_stage(self):
+        self.parse_stage = ParseStage(
+            parse_report, self.parsed, PARSE_IN_PROCESS, name=f"parse-{self.container_num}"
+        ).start()
+
+    def stop_parse_stage(self):
+        if self.parse_stage is not None:
+            self.parse_stage.stop()
+            self.parse_stage = None
+
+    def parsed(self, result, error, elapsed_ms):
+        """
+        Parse stage callback (runs on the stage thread): row-level check,
+        history, publish. With a stage running, every result of the run comes
+        through here, in order (see queue_rows), so the ChangeDetector and the
+        station changes are only ever updated from this thread.
+        """
+        if elapsed_ms is not None:
+            METRICS.record("parse+organize", elapsed_ms)
+        if not self._is_running:
+            return
+        if error is not None:
+            # queue_html() already stored this body's fingerprint: parse it again next cycle
+            self.changes.forget()
+            self.status_update.emit(f"HTML/BS4 Extraction Error: {error}")
+            return
+        self.publish(self.changes.process_parsed(*result))
 
-            # --- 1. Initial Report Setup ---
-            if not switch_into_report_iframe(sb):
-                self.status_update.emit("ERROR: Could not locate report iframe. Check URL/Permissions.")
+    def publish(self, organized_data):
+        """Sends changed data to the GUI; None (unchanged) only updates the status line."""
+        if organized_data is PARSE_QUEUED:
+            return
+        if self.started_at is not None:
+            METRICS.record("time to first data", (time.perf_counter() - self.started_at) * 1000)
+            self.started_at = None
+        if organized_data is None:
+            self.status_update.emit(f"No changes since last refresh ({self.changes.summary()}).")
+            return
+        # With a parse stage this runs on the stage thread only, so batches leave in seq order
+        batch = self.changes.station_changes(organized_data)
+        if batch is not None:
+            # "emit" is the thread side only; the GUI records queue latency as "deliver"
+            METRICS.mark("emit")
+            with METRICS.stage("emit"):
+                self.stations_changed.emit(batch)
+        self.status_update.emit(
+            f"Data fetched and processed: {len(organized_data)} task lists found, "
+            f"{len(batch.changes) if batch else 0} station changes ({self.changes.summary()})."
+        )
+
+    def station_snapshot(self, container=None):
+        """Full station batch last sent, for a GUI that missed a batch."""
+        return self.changes.stations.snapshot()
+
+    def sleep_until_next_check(self, seconds=None):
+        """Sleeps seconds (default: random 3-15), returning at once on stop(). Returns the delay."""
+        random_delay_seconds = seconds if seconds is not None else random.randint(3, 15)
+        self.sleep_for(random_delay_seconds)
+        return random_delay_seconds
+
+    def sleep_for(self, seconds):
+        """Sleeps up to seconds (fractional), returning at once on stop()."""
+        if seconds > 0:
+            self.cancel.wait(seconds)
+
+    def replay_snapshots(self, containers):
+        """Recorded snapshots of containers from REPLAY_ARCHIVE, paced by REPLAY_SPEED."""
+        if not REPLAY_ARCHIVE:
+            raise RuntimeError("DHR_REPLAY_ARCHIVE is not set")
+        self.status_update.emit(f"Replaying {REPLAY_ARCHIVE} at {REPLAY_SPEED:g}x...")
+        previous = None
+        for snap in iter_archive(REPLAY_ARCHIVE):
+            if snap.container not in containers:
+                continue
+            if previous is not None and REPLAY_SPEED > 0:
+                self.sleep_for((snap.t - previous) / REPLAY_SPEED)
+            if not self._is_running:
                 return
+            previous = snap.t
+            yield snap
 
-            self.status_update.emit(f"Entering container number: {self.container_num}")
-            sb.wait_for_element('input[name="ReportViewerControl$ctl04$ctl03$txtValue"]')
-            sb.type('input[name="ReportViewerControl$ctl04$ctl03$txtValue"]', self.container_num)
-            time.sleep(1)
+    def idle_until_stopped(self, status):
+        """Keeps the last replayed snapshot on screen (and the parse stage running) until Stop."""
+        self.status_update.emit(status)
+        self.cancel.wait()
 
-            self.status_update.emit("Setting date filter to 'Today'.")
-            sb.wait_for_element('select[name="ReportViewerControl$ctl04$ctl09$ddValue"]')
-            sb.select_option_by_text(
-                'select[name="ReportViewerControl$ctl04$ctl09$ddValue"]',
-                "Today"
-            )
-            time.sleep(1)
+    def run_replay(self):
+        """Archive playback through the live path: fingerprint -> parse stage -> stations_changed."""
+        try:
+            self.start_parse_stage()
+            for snap in self.replay_snapshots({self.container_num}):
+                with METRICS.stage("cycle"):
+                    if self.changes.changed_html(snap.body, snap.format):
+                        self.parse_stage.submit(snap.body, snap.format)
+                    else:
+                        self.publish(None)
+                dump_metrics()
+            self.idle_until_stopped(f"Replay finished ({self.changes.summary()}).")
+        finally:
+            self.stop_parse_stage()
 
-            if not switch_into_report_iframe(sb):
-                self.status_update.emit("ERROR: iframe missing after date selection.")
-                return
+    def run_http(self):
+        """Browserless loop: render the report over one persistent HTTP session."""
+        client = self.client = ReportHTTPClient(REPORT_SERVER_URL, REPORT_PATH, self.username, self.password)
+        try:
+            self.start_parse_stage()
+            self.status_update.emit(f"Requesting report over HTTP ({client.render_format})...")
+            while self._is_running:
+                try:
+                    with METRICS.stage("cycle"):
+                        with METRICS.stage("fetch"):
+                            body = client.fetch(self.container_num)
+                        if self.changes.changed_html(body, client.render_format):
+                            self.parse_stage.submit(body, client.render_format)
+                        else:
+                            self.publish(None)
+                    dump_metrics()
+                    self.sleep_until_next_check()
+
+                except RuntimeError as re:
+                    if not self._is_running: break
+                    self.status_update.emit(f"HTTP Report Error: {re}")
+                    self.sleep_for(5)
+
+                except Exception as e:
+                    if not self._is_running: break
+                    self.status_update.emit(f"MONITORING LOOP ERROR: {e}")
+                    self.sleep_for(10)
+        finally:
+            self.stop_parse_stage()
+            self.client = None
+            client.close()
+
+    def open_report(self, sb):
+        """Logs in and opens the ReportViewer, leaving the context in the report iframe."""
+        AUTH_URL = (
+            f"https://{self.username}:{self.password}@"
+            f"{urlsplit(REPORT_URL).netloc}"
+            f"{urlsplit(REPORT_URL).path}"
+        )
+
+        self.status_update.emit("Opening report URL and attempting login...")
+        self.timed("login", sb.open, AUTH_URL)
+        self.timed("open report", sb.open, REPORT_URL)
+
+        if not self.timed("find iframe", self.enter_report_iframe, sb):
+            self.status_update.emit("ERROR: Could not locate report iframe. Check URL/Permissions.")
+            return False
+        return True
+
+    def prepare_session(self, session, container_num=None):
+        """
+        Brings a (possibly reused) browser session to the report for container_num:
+        login + open only if the session has no live report, parameters only if
+        another container is showing. Leaves the context in the report iframe.
+        """
+        sb = session.sb
+        self.iframe_selector = session.iframe_selector
+        if session.report_open:
+            sb.switch_to_default_content()
+            if self.timed("reuse session", self.enter_report_iframe, sb, NAV_TIMEOUT):
+                self.status_update.emit("Reusing the open browser session.")
+            else:
+                session.reset()
+
+        if not session.report_open:
+            if not self.open_report(sb):
+                return False
+            session.report_open = True
+
+        if container_num is not None and session.container != container_num:
+            session.container = None
+            if not self.submit_parameters(sb, container_num):
+                return False
+            session.container = container_num
+        session.iframe_selector = self.iframe_selector
+        return True
+
+    def submit_parameters(self, sb, container_num):
+        """Enters container + date 'Today' and clicks View Report; True once the report is loaded."""
+        self.status_update.emit(f"Entering container number: {container_num}")
+        self.wait_for_element(sb, 'input[name="ReportViewerControl$ctl04$ctl03$txtValue"]')
+        sb.type('input[name="ReportViewerControl$ctl04$ctl03$txtValue"]', container_num)
+        self.timed("container postback", self.wait_for, lambda: report_idle(sb), NAV_TIMEOUT)
+
+        self.status_update.emit("Setting date filter to 'Today'.")
+        self.wait_for_element(sb, 'select[name="ReportViewerControl$ctl04$ctl09$ddValue"]')
+        sb.select_option_by_text(
+            'select[name="ReportViewerControl$ctl04$ctl09$ddValue"]',
+            "Today"
+        )
+        self.timed("date postback", self.wait_for, lambda: report_idle(sb), NAV_TIMEOUT)
+
+        if not self.enter_report_iframe(sb):
+            self.status_update.emit("ERROR: iframe missing after date selection.")
+            return False
+
+        self.status_update.emit(f"Viewing report for {container_num}...")
+        self.wait_for_element(sb, 'input[id="ReportViewerControl_ctl04_ctl00"]')
+        sb.execute_script(MARK_REPORT_JS, list(REPORT_DIV_IDS))  # in case a stale report is showing
+        sb.click('input[id="ReportViewerControl_ctl04_ctl00"]')
+        if not self.timed("view report", self.wait_for, lambda: report_rendered(sb), REPORT_TIMEOUT):
+            self.status_update.emit("WARNING: report not rendered yet, continuing.")
+
+        if not self.enter_report_iframe(sb):
+            self.status_update.emit("ERROR: iframe missing after View Report. This step is critical.")
+            return False
+        
+        # Wait for the report to confirm content load
+        self.wait_for_element(sb, '//div[contains(text(), "DHR Report")]', timeout=60)
+        return True
+
+    def read_report(self, sb, changes):
+        """
+        Rows in-browser (or the full HTML) -> organized data, or None if unchanged.
+        With a parse stage running, changed HTML and extracted rows are queued there
+        instead (PARSE_QUEUED).
+        """
+        # Needs to be on default content
+        sb.switch_to_default_content()
+        total, estimated = report_pages(sb)
+        if total > 1 or estimated:
+            if self.pages_over_http:
+                try:
+                    return self.read_all_pages(changes, total, estimated)
+                except MonitorStopped:
+                    raise
+                except Exception as e:
+                    if not self._is_running:
+                        raise MonitorStopped() from e
+                    # e.g. no URL access / different parameter names: don't retry every cycle
+                    self.pages_over_http = False
+                    self.status_update.emit(
+                        f"⚠️ Could not render the {total} report pages over HTTP ({e}); paging through the viewer instead."
+                    )
+            return self.read_viewer_pages(sb, changes)
+        with METRICS.stage("fetch rows (in browser)"):
+            # Recording needs the page itself
+            rows = extract_in_browser(sb) if EXTRACT_IN_BROWSER and changes.archive is None else None
+        if rows is not None:
+            return self.queue_rows(changes, rows)
+        with METRICS.stage("fetch page source"):
+            html_content = sb.get_page_source()
+        return self.queue_html(changes, html_content, "page")
+
+    def read_all_pages(self, changes, total, estimated):
+        """
+        Multi-page report: the viewer holds only the current page, so every
+        page is rendered over HTTP, concurrently (or in one non-paginated
+        render while the viewer's count is an estimate). Pages are parsed as
+        they arrive and their rows joined in page order before organize().
+        """
+        if self.client is None:
+            self.client = ReportHTTPClient(REPORT_SERVER_URL, REPORT_PATH, self.username, self.password, "HTML4.0")
+        METRICS.gauge("report pages", total)
 
-            self.status_update.emit("Viewing report for the first time...")
-            sb.wait_for_element('input[id="ReportViewerControl_ctl04_ctl00"]')
-            sb.click('input[id="ReportViewerControl_ctl04_ctl00"]')
-            time.sleep(5)
+        def fetched(body):
+            return body, page_cells(body)
 
-            if not switch_into_report_iframe(sb):
-                self.status_update.emit("ERROR: iframe missing after View Report. This step is critical.")
+        with METRICS.stage("fetch+parse pages"):
+            if estimated:
+                pages = [fetched(self.client.fetch(changes.container))]
+            else:
+                pages = self.client.fetch_pages(changes.container, range(1, total + 1), fetched)
+        self.check_stopped()
+        # The pages as one body: byte-level skip and archive record, like a single page
+        if not changes.changed_html(pages_body([body for body, _ in pages], "HTML4.0"), PAGES_FORMAT):
+            return None
+        with METRICS.stage("extract"):
+            rows = rows_from_pages(cells for _, cells in pages)
+        return self.queue_rows(changes, rows, counted=True)
+
+    def read_viewer_pages(self, sb, changes):
+        """
+        Multi-page report without HTTP renders: clicks through the viewer's
+        pages (First, then Next until it is disabled) and reads each page
+        source. One postback per page, so slower than read_all_pages().
+        """
+        bodies = []
+        with METRICS.stage("fetch pages (viewer)"):
+            self.turn_page(sb, "First")
+            while True:
+                self.check_stopped()
+                sb.switch_to_default_content()
+                bodies.append(sb.get_page_source())
+                if not self.turn_page(sb, "Next"):
+                    break
+        METRICS.gauge("report pages", len(bodies))
+        return self.queue_html(changes, pages_body(bodies, "page"), PAGES_FORMAT)
+
+    def turn_page(self, sb, button):
+        """Clicks the viewer's First/Next page button and waits for the page; False if it is disabled."""
+        self.check_stopped()
+        sb.switch_to_default_content()
+        sb.execute_script(MARK_REPORT_JS, list(REPORT_DIV_IDS))
+        if not sb.execute_script(VIEWER_PAGE_JS, button):
+            return False
+        if not self.wait_for(lambda: report_rendered(sb), REPORT_TIMEOUT):
+            raise TimeoutError(f"Report page did not render after '{button}' ({REPORT_TIMEOUT} s)")
+        return True
+
+    def queue_html(self, changes, body, render_format):
+        """
+        Byte-level check for a fetched body; with a parse stage running, a
+        changed body is parsed there (PARSE_QUEUED).
+        """
+        if self.parse_stage is None or changes is not self.changes:
+            return changes.process_html(body, render_format)
+        if not changes.changed_html(body, render_format):
+            return None
+        self.parse_stage.submit(body, render_format)
+        return PARSE_QUEUED
+
+    def queue_rows(self, changes, rows, counted=False):
+        """
+        Row-level check for rows extracted on this thread. With a parse stage
+        running they are queued behind any parse still in flight (PARSE_QUEUED),
+        so a late parse result can never overwrite newer rows. counted: the
+        cycle was already counted by changed_html().
+        """
+        if self.parse_stage is None or changes is not self.changes:
+            return changes.process_parsed(rows) if counted else changes.process_rows(rows)
+        if not counted:
+            changes.count_cycle()
+        self.parse_stage.submit_result((rows, None))
+        return PARSE_QUEUED
+
+    def close_client(self):
+        client, self.client = self.client, None
+        if client is not None:
+            client.close()
+
+    def run_selenium(self):
+        session = None
+        try:
+            self.start_parse_stage()
+            # --- 1. Initial Report Setup (skipped as far as a reused session allows) ---
+            session = self.session = self.timed(
+                "browser session", SESSIONS.acquire, self.username, self.password, self.container_num
+            )
+            self.check_stopped()
+            sb = session.sb
+            if not self.prepare_session(session, self.container_num):
+                session.reset()
                 return
             
-            # Wait for the report to confirm content load
-            sb.wait_for_element('//div[contains(text(), "DHR Report")]', timeout=60)
-            
             self.status_update.emit("Report loaded. Starting monitoring loop.")
             
             # --- 2. Monitoring Loop: get html -> parse -> render -> refresh ---
             while self._is_running:
                 try:
-                    # a. Get HTML (needs to be on default content)
-                    sb.switch_to_default_content()
-                    html_content = sb.get_page_source()
-                    
-                    # b. Parse data with BS4
-                    rows = extract(html_content)
-                    organized_data = organize(rows)
-                    
-                    # c. Send data to PyQt for rendering
-                    self.data_fetched.emit(organized_data)
-                    self.status_update.emit(f"Data fetched and processed: {len(organized_data)} task lists found.")
+                    with METRICS.stage("cycle"):
+                        # a.+b. Get rows and organize, short-circuited when the report is unchanged
+                        organized_data = self.read_report(sb, self.changes)
+
+                        # c. Send data to PyQt for rendering (no emit -> no repaint when unchanged)
+                        self.publish(organized_data)
+                    dump_metrics()
 
                     # d. Determine sleep time
-                    random_delay_seconds = random.randint(3, 15)
-                    for i in range(random_delay_seconds):
-                        if not self._is_running: break
-                        time.sleep(1)
-                    
+                    random_delay_seconds = self.sleep_until_next_check()
                     if not self._is_running: break
 
                     # e. Refresh the report (needs to be on default content)
                     self.status_update.emit(f"Refreshing report... (Next check in {random_delay_seconds} seconds)")
                     
-                    sb.switch_to_default_content() 
-                    sb.wait_for_element("span.glyphui-refresh")
-                    sb.click("span.glyphui-refresh")
-                    time.sleep(5) 
-
-                    # f. Wait for the report to reload before the next loop iteration
-                    if not switch_into_report_iframe(sb):
+                    with METRICS.stage(f"refresh [{session.mode}]"):
+                        sb.switch_to_default_content() 
+                        sb.execute_script(MARK_REPORT_JS, list(REPORT_DIV_IDS))
+                        self.wait_for_element(sb, "span.glyphui-refresh")
+                        sb.click("span.glyphui-refresh")
+
+                        # f. Wait for the report to reload before the next loop iteration
+                        rendered = self.timed("refresh", self.wait_for, lambda: report_rendered(sb), REPORT_TIMEOUT)
+                    METRICS.gauge(f"browser MB [{session.mode}]", session.memory_mb())
+                    if not rendered:
+                        self.status_update.emit("WARNING: refresh did not re-render the report in time.")
+                    if not self.enter_report_iframe(sb):
                         self.status_update.emit("ERROR: Lost iframe after refresh. Exiting monitoring loop.")
+                        session.reset()
                         break
 
+                except MonitorStopped:
+                    break
+
                 except RuntimeError as re:
+                    if not self._is_running: break
                     self.status_update.emit(f"HTML/BS4 Extraction Error: {re}")
-                    time.sleep(5)
+                    self.sleep_for(5)
                 
                 except Exception as e:
+                    if not self._is_running: break
                     self.status_update.emit(f"MONITORING LOOP ERROR: {e}")
-                    time.sleep(10)
-            
-        except Exception as e:
-            self.status_update.emit(f"MONITORING CRASHED: {e}")
-            
+                    self.sleep_for(10)
+
+        finally:
+            self.stop_parse_stage()
+            self.close_client()
+            self.session = None
+            if session:
+                SESSIONS.release(session)
+
+
+class ContainerScheduler:
+    """Thread-safe round-robin over the containers, skipping ones a worker is already fetching."""
+    def __init__(self, containers):
+        self.containers = list(containers)
+        self._next = 0
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Next container to fetch (now marked in flight), or None if all are busy."""
+        with self._lock:
+            for _ in range(len(self.containers)):
+                container = self.containers[self._next]
+                self._next = (self._next + 1) % len(self.containers)
+                if container not in self._in_flight:
+                    self._in_flight.add(container)
+                    return container
+            return None
+
+    def release(self, container):
+        with self._lock:
+            self._in_flight.discard(container)
+
+
+class ContainerPoolWorker(DHRMonitorThread):
+    """
+    One browser session (or HTTP session) serving many containers: each
+    iteration takes the next container from the pool's scheduler, submits
+    its parameters, and emits that container's station changes.
+    """
+    container_changed = pyqtSignal(str, object)
+
+    def __init__(self, pool, username, password, fetch_engine=None, parent=None):
+        super().__init__(None, username, password, fetch_engine, parent)
+        self.pool = pool
+
+    def attach_history(self):
+        self.pool.attach_history(self)
+
+    def emit_changes(self, container, organized_data):
+        """Sends container's station changes for new organized data (None: unchanged)."""
+        if organized_data is None:
+            return
+        # Called while the scheduler holds container, so one worker at a time emits its batches
+        batch = self.pool.changes[container].station_changes(organized_data)
+        if batch is not None:
+            METRICS.mark("emit")
+            with METRICS.stage("emit"):
+                self.container_changed.emit(container, batch)
+
+    def fetch_next(self, fetch):
+        """Runs fetch(container) -> rows/organized for the next scheduled container."""
+        container = self.pool.scheduler.acquire()
+        if container is None:
+            self.sleep_until_next_check(1)
+            return
+        try:
+            with METRICS.stage("cycle"):
+                self.emit_changes(container, fetch(container))
+            dump_metrics()
+            self.status_update.emit(f"[{container}] {self.pool.changes[container].summary()}")
+        except RuntimeError as re:
+            if not self._is_running:
+                raise MonitorStopped() from re
+            self.status_update.emit(f"[{container}] Report Error: {re}")
+        finally:
+            self.pool.scheduler.release(container)
+        self.sleep_until_next_check(POOL_PAUSE_SECONDS)
+
+    def run_http(self):
+        client = self.client = ReportHTTPClient(REPORT_SERVER_URL, REPORT_PATH, self.username, self.password)
+
+        def fetch(container):
+            with METRICS.stage("fetch"):
+                body = client.fetch(container)
+            return self.pool.changes[container].process_html(body, client.render_format)
+
+        try:
+            while self._is_running:
+                try:
+                    self.fetch_next(fetch)
+                except MonitorStopped:
+                    break
+                except Exception as e:
+                    if not self._is_running: break
+                    self.status_update.emit(f"MONITORING LOOP ERROR: {e}")
+                    self.sleep_for(10)
         finally:
-            if sb:
-                sb.quit() 
+            self.client = None
+            client.close()
+
+    def run_replay(self):
+        """One worker plays back the archive for every container of the pool, in recorded order."""
+        for snap in self.replay_snapshots(self.pool.changes):
+            with METRICS.stage("cycle"):
+                changes = self.pool.changes[snap.container]
+                self.emit_changes(snap.container, changes.process_html(snap.body, snap.format))
+            dump_metrics()
+        self.idle_until_stopped("Replay finished.")
+
+    def run_selenium(self):
+        session = None
+
+        def fetch(container):
+            # read_report() left the context on the top document
+            sb = session.sb
+            session.container = None
+            with METRICS.stage(f"refresh [{session.mode}]"):
+                if not self.enter_report_iframe(sb) or not self.submit_parameters(sb, container):
+                    raise RuntimeError("could not submit report parameters")
+            session.container = container
+            METRICS.gauge(f"browser MB [{session.mode}]", session.memory_mb())
+            return self.read_report(sb, self.pool.changes[container])
+
+        try:
+            session = self.session = SESSIONS.acquire(self.username, self.password)
+            self.check_stopped()
+            if not self.prepare_session(session):
+                session.reset()
+                return
+            while self._is_running:
+                try:
+                    self.fetch_next(fetch)
+                except MonitorStopped:
+                    break
+                except Exception as e:
+                    if not self._is_running: break
+                    self.status_update.emit(f"MONITORING LOOP ERROR: {e}")
+                    self.sleep_for(10)
+        finally:
+            self.close_client()
+            self.session = None
+            if session:
+                SESSIONS.release(session)
+
+
+class ContainerPool(QObject):
+    """
+    Bounded pool of ContainerPoolWorkers scheduled round-robin over a
+    container list. Mirrors DHRMonitorThread's interface (start/stop,
+    status_update, monitoring_stopped) plus a per-container station changes signal.
+    """
+    status_update = pyqtSignal(str)
+    monitoring_stopped = pyqtSignal()
+    container_changed = pyqtSignal(str, object)
+
+    def __init__(self, containers, username, password, pool_size=None, fetch_engine=None, parent=None):
+        super().__init__(parent)
+        self.scheduler = ContainerScheduler(containers)
+        self.changes = {container: ChangeDetector(None, container, open_archive()) for container in containers}
+        # Set by the first worker to run after each start() (attach_history)
+        self._history_attached = False
+        self._history_lock = threading.Lock()
+        size = min(pool_size or POOL_SIZE, len(containers))
+        if (fetch_engine or FETCH_ENGINE) == "replay":
+            size = 1    # the archive is one ordered stream
+        self.workers = [
+            ContainerPoolWorker(self, username, password, fetch_engine) for _ in range(size)
+        ]
+        self._running_workers = 0
+
+    def start(self):
+        self._history_attached = False
+        for worker in self.workers:
+            worker.status_update.connect(self.status_update)
+            worker.container_changed.connect(self.container_changed)
+            worker.monitoring_stopped.connect(self._worker_stopped)
+            self._running_workers += 1
+            worker.start()
+
+    def stop(self):
+        for worker in self.workers:
+            worker.stop()
+
+    def station_snapshot(self, container):
+        return self.changes[container].stations.snapshot()
+
+    def attach_history(self, worker):
+        """Opens and maintains the history once per start, on the first worker; the others wait for it."""
+        with self._history_lock:
+            if self._history_attached:
+                return
+            self._history_attached = True
+            history = worker.open_history()
+            for changes in self.changes.values():
+                changes.history = history
+
+    def _worker_stopped(self):
+        self._running_workers -= 1
+        if self._running_workers == 0:
             self.monitoring_stopped.emit()
 
 # ==============================================================================
@@ -350,6 +1434,16 @@ COLOR_START_MONITORING_ENABLED = QColor("#4c8e35")
 COLOR_STOP_MONITORING = QColor("#a63c3a")         
 COLOR_BUTTON_DISABLED = QColor("#d0d0d0")         
 
+# Shared brushes: updates swap these in instead of allocating new ones
+BRUSH_RED = QBrush(COLOR_RED)
+BRUSH_GREEN = QBrush(COLOR_GREEN)
+STATUS_BRUSHES = {
+    "no_employee": QBrush(COLOR_BLACK),
+    "logged_in": BRUSH_RED,
+    "in_progress": QBrush(COLOR_ORANGE),
+    "completed": BRUSH_GREEN,
+}
+
 FONT_HEADER = QFont("Arial", 10, QFont.Weight.Bold)
 FONT_USER = QFont("Arial", 22, QFont.Weight.Bold)
 FONT_TASK = QFont("Arial", 11, QFont.Weight.Bold)
@@ -379,12 +1473,46 @@ STATION_MAPPING = {
     "MQI-2565_QC_Insp_05": "QC"
 }
 
+# Shift shown at start: a SHIFT_TIMES name, or SHIFT_BY_CLOCK to follow the clock
+SHIFT_BY_CLOCK = "current"
+DISPLAY_SHIFT = os.environ.get("DHR_DISPLAY_SHIFT", "swing")
+SHIFT_CLOCK_CHECK_MS = 30000
+
+def shift_by_clock(now=None):
+    """Shift in progress now, or the last one to end (between shifts)."""
+    now = now or datetime.now()
+    return SHIFTS.latest_at(now.hour * 3600 + now.minute * 60 + now.second)
+
+def station_views(organized_data):
+    """
+    Organized snapshot -> {shift: {station: (employee, frozenset of tasks)}}
+    for every shift at once, so switching the displayed shift needs no
+    re-parse. Also the unit the thread diffs to send changes (station_delta).
+    """
+    views = {s: {} for s in SHIFTS.names}
+    for container_dict in organized_data:
+        for task_list, shifts in container_dict.items():
+            station_name = STATION_MAPPING.get(task_list)
+            if station_name is None:
+                continue
+            for shift, shift_data in shifts.items():
+                views.setdefault(shift, {})[station_name] = (
+                    shift_data.get("employee", ""),
+                    frozenset(shift_data.get("task_completed", ())),
+                )
+    return views
+
 def update_timestamp(last_check_time: datetime) -> str:
     """Formats the time string as: MM/DD/YYYY HH:SS AM/PM."""
     return last_check_time.strftime("%m/%d/%Y %I:%M:%S %p")
 
 class StationNode:
-    """Represents a single station's visual element and data."""
+    """
+    Represents a single station's visual element and data. Scene items are
+    created once; update_status() only mutates the brushes/text that changed.
+    Completed tasks are a bitmask in STATION_CONFIG task order, so a station's
+    state is (employee, mask) and compares in O(1).
+    """
     def __init__(self, name, config, scene):
         self.name = name
         self.config = config
@@ -395,8 +1523,14 @@ class StationNode:
         self.node_size = 70
         self.status = "no_employee" 
         self.employee = "Waiting..."
-        self.tasks = {task: False for task in config["tasks"]}
+        self.tasks = tuple(config["tasks"])
+        self.task_bits = {task: 1 << i for i, task in enumerate(self.tasks)}
+        self.all_done = (1 << len(self.tasks)) - 1
+        self.mask = 0
         self.items = []
+        self.task_dots = {}
+        self.task_texts = {}
+        self.text_width = None
         self.create_graphics()
     
     def clear_graphics(self):
@@ -404,17 +1538,14 @@ class StationNode:
             if item.scene():
                 self.scene.removeItem(item)
         self.items = []
+        self.task_dots = {}
+        self.task_texts = {}
 
     def create_graphics(self):
         self.clear_graphics()
 
         border_pen = QPen(COLOR_NODE_Border, 5)
-        fill_color = COLOR_BLACK
-        if self.status == "logged_in": fill_color = COLOR_RED
-        elif self.status == "in_progress": fill_color = COLOR_ORANGE
-        elif self.status == "completed": fill_color = COLOR_GREEN
-
-        shape_brush = QBrush(fill_color)
+        shape_brush = STATUS_BRUSHES[self.status]
         
         if self.shape == "circle":
             shape_item = self.scene.addEllipse(self.x - self.node_size/2, self.y - self.node_size/2, self.node_size, self.node_size, border_pen, shape_brush)
@@ -426,38 +1557,43 @@ class StationNode:
             shape_item = self.scene.addPolygon(points, border_pen, shape_brush)
         
         shape_item.setZValue(2)
+        self.shape_item = shape_item
         self.items.append(shape_item)
 
-        text_group_items = []
-        header_txt = self.scene.addText(f"{self.name}:")
-        header_txt.setDefaultTextColor(COLOR_TEXT_HEADER)
-        header_txt.setFont(FONT_HEADER)
-        text_group_items.append(header_txt)
-        
-        user_txt = self.scene.addText(self.employee)
-        user_txt.setDefaultTextColor(COLOR_TEXT_USER)
-        user_txt.setFont(FONT_USER)
-        user_txt.setPos(0, header_txt.boundingRect().height() - 5)
-        text_group_items.append(user_txt)
-        
-        current_y = user_txt.pos().y() + user_txt.boundingRect().height() + 5
-        
-        for task_name, is_done in self.tasks.items():
-            dot_color = COLOR_GREEN if is_done else COLOR_RED
-            dot = self.scene.addEllipse(0, 0, 16, 16, QPen(Qt.NoPen), QBrush(dot_color))
-            dot.setPos(0, current_y + 4)
-            text_group_items.append(dot)
-            
+        self.header_txt = self.scene.addText(f"{self.name}:")
+        self.header_txt.setDefaultTextColor(COLOR_TEXT_HEADER)
+        self.header_txt.setFont(FONT_HEADER)
+        
+        self.user_txt = self.scene.addText(self.employee)
+        self.user_txt.setDefaultTextColor(COLOR_TEXT_USER)
+        self.user_txt.setFont(FONT_USER)
+        self.items.extend([self.header_txt, self.user_txt])
+        
+        for task_name in self.tasks:
+            is_done = self.mask & self.task_bits[task_name]
+            dot = self.scene.addEllipse(0, 0, 16, 16, QPen(Qt.NoPen), BRUSH_GREEN if is_done else BRUSH_RED)
             t_txt = self.scene.addText(task_name)
             t_txt.setDefaultTextColor(COLOR_TEXT_TASK)
             t_txt.setFont(FONT_TASK)
-            t_txt.setPos(25, current_y)
-            text_group_items.append(t_txt)
+            self.task_dots[task_name] = dot
+            self.task_texts[task_name] = t_txt
+            self.items.extend([dot, t_txt])
+
+        self.layout_text()
+
+    def layout_text(self):
+        """Positions the text block around the node; only needed when the text width changes."""
+        # Block-relative positions first: header, employee, then one dot + label per task
+        header_h = self.header_txt.boundingRect().height()
+        user_y = header_h - 5
+        placed = [(self.header_txt, 0, 0), (self.user_txt, 0, user_y)]
+        current_y = user_y + self.user_txt.boundingRect().height() + 5
+        for task_name in self.tasks:
+            placed.append((self.task_dots[task_name], 0, current_y + 4))
+            placed.append((self.task_texts[task_name], 25, current_y))
             current_y += 25
 
-        self.items.extend(text_group_items)
-
-        max_width = max(item.boundingRect().width() + item.x() for item in text_group_items)
+        max_width = max(item.boundingRect().width() + x for item, x, _ in placed)
         text_block_height = current_y
         vertical_offset_to_center = self.y - (text_block_height / 2)
 
@@ -474,23 +1610,55 @@ class StationNode:
             start_x = self.x - self.node_size/2 - SPACING - max_width 
             start_y = vertical_offset_to_center 
 
-        for item in text_group_items:
-            if item is header_txt or item is user_txt:
+        for item, x, y in placed:
+            if item is self.header_txt or item is self.user_txt:
                 offset_x = (max_width - item.boundingRect().width()) / 2 if self.layout_type in ("top", "bottom") else 0
-                item.setPos(start_x + offset_x, start_y + item.y())
+                item.setPos(start_x + offset_x, start_y + y)
             else:
-                item.setPos(start_x + item.x(), start_y + item.y())
+                item.setPos(start_x + x, start_y + y)
+        self.text_width = self.user_txt.boundingRect().width()
+
+    def task_mask(self, tasks_completed):
+        """Bitmask of this station's tasks found in tasks_completed (other tasks ignored)."""
+        bits = self.task_bits
+        mask = 0
+        for task in tasks_completed:
+            mask |= bits.get(task, 0)
+        return mask
 
     def update_status(self, employee, tasks_completed):
-        """Updates the node's data and triggers a redraw."""
-        self.employee = employee if employee else "Waiting..."
-        for task in self.tasks: self.tasks[task] = task in tasks_completed
-        
-        if not employee: self.status = "no_employee"
-        elif all(self.tasks.values()): self.status = "completed"
-        elif any(self.tasks.values()): self.status = "in_progress"
-        else: self.status = "logged_in"
-        self.create_graphics()
+        """
+        Updates the node's data, touching only the items whose state changed.
+        Returns True if the text layout (and so the scene bounds) changed.
+        """
+        employee_text = employee if employee else "Waiting..."
+        mask = self.task_mask(tasks_completed)
+        if employee_text == self.employee and mask == self.mask:
+            return False
+
+        layout_changed = False
+        if employee_text != self.employee:
+            self.employee = employee_text
+            self.user_txt.setPlainText(employee_text)
+            if self.user_txt.boundingRect().width() != self.text_width:
+                self.layout_text()
+                layout_changed = True
+
+        changed = mask ^ self.mask
+        if changed:
+            self.mask = mask
+            for task, bit in self.task_bits.items():
+                if changed & bit:
+                    self.task_dots[task].setBrush(BRUSH_GREEN if mask & bit else BRUSH_RED)
+        
+        if not employee: status = "no_employee"
+        elif mask == self.all_done: status = "completed"
+        elif mask: status = "in_progress"
+        else: status = "logged_in"
+        if status != self.status:
+            self.status = status
+            self.shape_item.setBrush(STATUS_BRUSHES[status])
+        return layout_changed
 
 
 class ResizableGraphicsView(QGraphicsView):
@@ -500,11 +1668,28 @@ class ResizableGraphicsView(QGraphicsView):
         if self.scene():
             self.fitInView(self.scene().sceneRect(), Qt.KeepAspectRatio)
 
+def parse_containers(text):
+    """Container field -> list of container numbers (comma/space separated), duplicates dropped."""
+    return list(dict.fromkeys(c for c in re.split(r"[,;\s]+", text) if c))
+
 class MonitoringScreen(QWidget):
     def __init__(self, container, parent=None):
         super().__init__(parent)
-        self.container = container
+        # One or more containers; self.container is the one currently displayed
+        self.containers = parse_containers(container)
+        self.container = self.containers[0]
+        # Per-shift station data per container (see station_views), kept
+        # current by the threads' station changes; shift_views is the displayed one
+        self.container_views = {}
+        self.shift_views = self.container_views.setdefault(self.container, {})
+        # GUI stage input: (shift, station) pairs changed but not yet repainted
+        self.dirty_stations = set()
+        self.coalesced_changes = 0
+        # Seq of the last station batch applied per container (see receive_batch)
+        self.batch_seqs = {}
         self.stations = {}
+        self.shift_choice = DISPLAY_SHIFT if DISPLAY_SHIFT in SHIFTS.names + (SHIFT_BY_CLOCK,) else SHIFTS.names[-1]
+        self.displayed_shift = None
         self.last_check_time = datetime.now() 
         self.thread = None 
         self.setup_ui()
@@ -526,6 +1711,31 @@ class MonitoringScreen(QWidget):
         self.last_checked_label.setStyleSheet("color: #aaaaaa; font-size: 14px;")
         
         header_layout.addWidget(self.container_label)
+        if len(self.containers) > 1:
+            self.container_label.setText("Container:")
+            self.container_select = QComboBox()
+            self.container_select.addItems(self.containers)
+            self.container_select.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
+            self.container_select.currentTextChanged.connect(self.show_container)
+            header_layout.addWidget(self.container_select)
+        header_layout.addSpacing(30)
+        shift_label = QLabel("Shift:")
+        shift_label.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
+        self.shift_select = QComboBox()
+        for name in SHIFTS.names:
+            self.shift_select.addItem(name.capitalize(), name)
+        self.shift_select.addItem("Current (by clock)", SHIFT_BY_CLOCK)
+        self.shift_select.setCurrentIndex(self.shift_select.findData(self.shift_choice))
+        self.shift_select.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
+        self.shift_select.currentIndexChanged.connect(
+            lambda i: self.select_shift(self.shift_select.itemData(i))
+        )
+        header_layout.addWidget(shift_label)
+        header_layout.addWidget(self.shift_select)
+        # Follows the clock across shift boundaries while "current" is selected
+        self.shift_clock = QTimer(self)
+        self.shift_clock.timeout.connect(self.apply_shift)
+        self.shift_clock.start(SHIFT_CLOCK_CHECK_MS)
         header_layout.addStretch()
         header_layout.addWidget(self.last_checked_label)
         
@@ -541,6 +1751,19 @@ class MonitoringScreen(QWidget):
         self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         
+        # Stage timing overlay, top-left over the view
+        self.metrics_overlay = QLabel(self.view)
+        self.metrics_overlay.setStyleSheet(
+            "color: #e0e0e0; background-color: rgba(0, 0, 0, 160); font-family: monospace; font-size: 12px; padding: 6px;"
+        )
+        self.metrics_overlay.move(10, 10)
+        self.metrics_overlay.hide()
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.refresh_metrics_overlay)
+        QShortcut(QKeySequence("F3"), self, activated=self.toggle_metrics_overlay)
+        if METRICS_OVERLAY:
+            self.toggle_metrics_overlay()
+
         self.draw_workflow_lines()
         
         for name, config in STATION_CONFIG.items():
@@ -577,6 +1800,19 @@ class MonitoringScreen(QWidget):
         
         self.setLayout(layout)
 
+    def toggle_metrics_overlay(self):
+        if self.metrics_overlay.isVisible():
+            self.metrics_timer.stop()
+            self.metrics_overlay.hide()
+        else:
+            self.refresh_metrics_overlay()
+            self.metrics_overlay.show()
+            self.metrics_timer.start(1000)
+
+    def refresh_metrics_overlay(self):
+        self.metrics_overlay.setText(METRICS.to_table())
+        self.metrics_overlay.adjustSize()
+
     def showEvent(self, event):
         super().showEvent(event)
         QTimer.singleShot(50, lambda: self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio))
@@ -604,49 +1840,127 @@ class MonitoringScreen(QWidget):
         path_item.setZValue(0)
 
     def start_monitoring(self, username, password):
-        """Initializes and starts the Selenium thread."""
-        self.thread = DHRMonitorThread(self.container, username, password)
+        """Initializes and starts the Selenium thread (or a worker pool for several containers)."""
+        self.batch_seqs = {}    # a new thread numbers its batches from 1
+        if len(self.containers) > 1:
+            self.thread = ContainerPool(self.containers, username, password)
+            self.thread.container_changed.connect(self.store_changes)
+        else:
+            self.thread = DHRMonitorThread(self.container, username, password)
+            self.thread.stations_changed.connect(self.receive_changes)
         self.thread.status_update.connect(self.update_status_label)
         self.thread.monitoring_stopped.connect(self.monitoring_finished)
-        self.thread.data_fetched.connect(self.update_stations_from_data) 
         self.thread.start()
 
-    def update_status_label(self, status):
-        """Receives status updates from the monitoring thread."""
-        self.last_check_time = datetime.now()
-        self.last_checked_label.setText(f"Last Checked: {update_timestamp(self.last_check_time)} | Status: {status}")
+    def store_changes(self, container, batch):
+        """A pool worker's batch for one container; repaints only if it is the one displayed."""
+        METRICS.record_since("emit", "deliver")
+        self.receive_batch(container, batch)
 
-    def update_stations_from_data(self, organized_data):
+    def receive_changes(self, batch):
+        METRICS.record_since("emit", "deliver")
+        self.receive_batch(self.container, batch)
+
+    def receive_batch(self, container, batch):
         """
-        Receives the processed list of dictionaries from the thread 
-        and updates the visual nodes for the 'swing' shift.
+        Applies the batch if it follows the last one applied for container;
+        drops one already covered by a resync and replaces the view with the
+        thread's snapshot when a batch was missed.
         """
+        last = self.batch_seqs.get(container, 0)
+        if not batch.full and batch.seq <= last:
+            return
+        if not batch.full and batch.seq != last + 1 and self.thread is not None:
+            print(f"⚠️ [{container}] station batch {last + 1} missing (got {batch.seq}); resyncing")
+            batch = self.thread.station_snapshot(container)
+        views = self.container_views.setdefault(container, {})
+        if batch.full:
+            # Every station shown so far is repainted, including ones the snapshot no longer has
+            cleared = {(shift, station) for shift, stations in views.items() for station in stations}
+            for stations in views.values():
+                stations.clear()
+            self.batch_seqs[container] = batch.seq
+            self.queue_changes(container, batch.changes, cleared)
+            return
+        self.batch_seqs[container] = batch.seq
+        self.queue_changes(container, batch.changes)
+
+    def queue_changes(self, container, changes, touched=frozenset()):
+        """
+        Applies changes to the container's view now and repaints the touched
+        stations on the next event-loop pass, so a burst is painted once.
+        """
+        touched = apply_changes(self.container_views.setdefault(container, {}), changes) | touched
+        if container != self.container or not touched:
+            return
+        if self.dirty_stations:
+            self.coalesced_changes += 1
+        else:
+            QTimer.singleShot(0, self.apply_pending_changes)
+        self.dirty_stations |= touched
+
+    def apply_pending_changes(self):
+        """Repaints the stations changed in the displayed shift since the last pass."""
+        dirty, self.dirty_stations = self.dirty_stations, set()
+        if not dirty:
+            return
+        started = time.perf_counter()
         self.last_checked_label.setStyleSheet("color: #ffffff; font-size: 14px;") 
         QTimer.singleShot(2000, lambda: self.last_checked_label.setStyleSheet("color: #aaaaaa; font-size: 14px;")) 
-        
-        # Reset stations to default before applying new data
-        for station in self.stations.values():
-             station.update_status("", [])
 
-        # Apply new data
-        for container_dict in organized_data:
-            container_id = list(container_dict.keys())[0] 
-            container_data = container_dict[container_id]
-            
-            shift_data = container_data.get("swing", {})
-            employee = shift_data.get("employee", "")
-            tasks_completed = shift_data.get("task_completed", [])
-            
-            station_name = STATION_MAPPING.get(container_id)
-            
-            if station_name and station_name in self.stations:
-                self.stations[station_name].update_status(employee, tasks_completed)
-        
-        # Adjust view
-        bounds = self.scene.itemsBoundingRect()
-        buffer = 20
-        self.scene.setSceneRect(bounds.adjusted(-buffer, -buffer, buffer, buffer))
-        self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+        self.apply_shift()
+        self.update_stations({station for shift, station in dirty if shift == self.displayed_shift})
+        METRICS.record("apply", (time.perf_counter() - started) * 1000)
+
+    def show_container(self, container):
+        """Switches the view to another container from its cached view (no refetch)."""
+        self.container = container
+        self.shift_views = self.container_views.setdefault(container, {})
+        self.dirty_stations = set()
+        self.displayed_shift = None
+        self.apply_shift()
+
+    def update_status_label(self, status):
+        """Receives status updates from the monitoring thread."""
+        self.last_check_time = datetime.now()
+        self.last_checked_label.setText(f"Last Checked: {update_timestamp(self.last_check_time)} | Status: {status}")
+
+    def update_stations_from_data(self, organized_data):
+        """Shows a whole organized snapshot (e.g. a saved page) through the change path."""
+        self.queue_changes(self.container, diff_views(self.shift_views, station_views(organized_data)))
+        self.apply_pending_changes()
+
+    def select_shift(self, choice):
+        """Switches the displayed shift from the cached snapshot (no refetch, no re-parse)."""
+        started = time.perf_counter()
+        self.shift_choice = choice
+        self.apply_shift()
+        METRICS.record("shift switch", (time.perf_counter() - started) * 1000)
+
+    def apply_shift(self):
+        """One update per station for the selected shift; no-op if it is already shown."""
+        shift = shift_by_clock() if self.shift_choice == SHIFT_BY_CLOCK else self.shift_choice
+        if shift == self.displayed_shift:
+            return
+        self.displayed_shift = shift
+        self.update_stations(self.stations)
+
+    def update_stations(self, names):
+        """Brings the named stations to the displayed shift's data."""
+        # Mapped task lists get their data, the rest go idle
+        station_data = self.shift_views.get(self.displayed_shift, {})
+        layout_changed = False
+        for name in names:
+            employee, tasks_completed = station_data.get(name, ("", ()))
+            if self.stations[name].update_status(employee, tasks_completed):
+                layout_changed = True
+
+        # Adjust view only if some text block was re-laid out
+        if layout_changed:
+            bounds = self.scene.itemsBoundingRect()
+            buffer = 20
+            self.scene.setSceneRect(bounds.adjusted(-buffer, -buffer, buffer, buffer))
+            self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
 
     def monitoring_finished(self):
         """Handles cleanup when the thread exits."""
@@ -666,7 +1980,7 @@ class LoginScreen(QWidget):
         l1 = QLabel("Container:")
         l1.setStyleSheet("color: white; font-weight: bold; font-size: 16px;")
         self.entry_container = QLineEdit()
-        self.entry_container.setPlaceholderText("Enter Container ID (e.g., C-999)")
+        self.entry_container.setPlaceholderText("Enter Container ID(s) (e.g., C-999, C-1000)")
         self.apply_entry_style(self.entry_container)
         
         l2 = QLabel("Username:")
@@ -807,14 +2121,21 @@ class MainWindow(QMainWindow):
 
 
     def closeEvent(self, event):
-        """Ensure the Selenium thread is stopped when the main window closes."""
+        """Stops the Selenium thread without waiting; browsers are quit by shutdown() once the window is gone."""
         if self.monitor is not None and hasattr(self.monitor, 'thread') and self.monitor.thread:
             self.monitor.thread.stop()
         super().closeEvent(event)
 
 
 if __name__ == "__main__":
+    # Frozen (PyInstaller) build: a spawned parse worker must run the worker, not the app
+    import multiprocessing
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    QTimer.singleShot(BACKGROUND_IMPORT_DELAY_MS, preload_scraping_stack)
+    exit_code = app.exec()
+    # Browsers kept for reuse across Stop/Start go away with the app
+    shutdown()
+    sys.exit(exit_code)
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Precompiled shift classification.
+
+SHIFT_TIMES-style tables ({"day": ("8:00 AM", "2:40 PM"), ...}) are compiled
+once into a second-of-day lookup table, so classifying a row is one cached
+timestamp parse plus one index, with no strptime on the hot path.
+
+Boundaries are inclusive, overnight shifts (start > end) wrap past midnight,
+and the first matching shift in table order wins, like the original loop.
+"""
+import json
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+
+# JSON file overriding the built-in shift table: {"day": ["8:00 AM", "2:40 PM"], ...}
+SHIFT_CONFIG_ENV = "DHR_SHIFT_CONFIG"
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+FAST_TS_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4}) (\d{1,2}):(\d{2}):(\d{2}) ([AP]M)", re.ASCII)
+
+# ================= TIMESTAMPS =================
+
+@lru_cache(maxsize=65536)
+def second_of_day(ts):
+    """
+    Seconds since midnight of a "%m/%d/%Y %I:%M:%S %p" timestamp. Raises
+    ValueError exactly where strptime would. Memoized: report timestamps
+    repeat from cycle to cycle.
+    """
+    m = FAST_TS_RE.fullmatch(ts)
+    if m:
+        month, day, year, hour, minute, second = map(int, m.groups()[:6])
+        if 1 <= hour <= 12:
+            hour = hour % 12 + (12 if m.group(7) == "PM" else 0)
+            # Validates the date and time fields the same way strptime does
+            datetime(year, month, day, hour, minute, second)
+            return hour * 3600 + minute * 60 + second
+    # Unusual spacing/casing etc.: let strptime decide
+    t = datetime.strptime(ts, "%m/%d/%Y %I:%M:%S %p").time()
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _boundary(text):
+    t = datetime.strptime(text, "%I:%M %p").time()
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+# ================= CLASSIFIER =================
+
+class ShiftClassifier:
+    """Shift table compiled into integer second-of-day intervals and a lookup table."""
+
+    def __init__(self, shift_times):
+        self.names = tuple(shift_times)
+        # (name, start, end) with overnight shifts split at midnight
+        self.intervals = []
+        for name, (start_str, end_str) in shift_times.items():
+            start, end = _boundary(start_str), _boundary(end_str)
+            if start <= end:
+                self.intervals.append((name, start, end))
+            else:
+                self.intervals.append((name, start, SECONDS_PER_DAY - 1))
+                self.intervals.append((name, 0, end))
+
+        # table[second] -> index into self.names + 1 (0 = no shift); earlier shifts win
+        table = bytearray(SECONDS_PER_DAY)
+        for name, start, end in reversed(self.intervals):
+            index = self.names.index(name) + 1
+            table[start:end + 1] = bytes([index]) * (end - start + 1)
+        self._table = bytes(table)
+        self._lookup = (None,) + self.names
+
+    def shift_at(self, seconds):
+        """Shift name for a second-of-day, or None."""
+        return self._lookup[self._table[seconds]]
+
+    def latest_at(self, seconds):
+        """Shift in progress at a second-of-day, else the one that ended most recently (wrapping midnight)."""
+        current = self.shift_at(seconds)
+        if current or not self.intervals:
+            return current
+        return max(
+            (end if end <= seconds else end - SECONDS_PER_DAY, name)
+            for name, _, end in self.intervals
+        )[1]
+
+    def classify(self, ts):
+        """Shift name for a report timestamp, or None. Raises ValueError on bad timestamps."""
+        return self._lookup[self._table[second_of_day(ts)]]
+
+# ================= CONFIG =================
+
+def load_shift_times(path):
+    """Reads a shift table from JSON: {"name": ["start", "end"], ...} in priority order."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    shift_times = {name: tuple(bounds) for name, bounds in raw.items()}
+    ShiftClassifier(shift_times)  # fail fast on malformed boundaries
+    return shift_times
+
+
+def shift_times_from_env(default):
+    """The shift table named by $DHR_SHIFT_CONFIG, or default if unset."""
+    path = os.environ.get(SHIFT_CONFIG_ENV)
+    return load_shift_times(path) if path else default
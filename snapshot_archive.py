@@ -0,0 +1,132 @@
+"""
+Compressed, timestamped archive of fetched report pages, for replay.
+
+Each fetch is one JSON record {"t", "container", "format", "body"} written as
+its own gzip member, so the file is always readable up to the last complete
+fetch even if the app is killed mid-write. A fetch whose report is unchanged
+since the previous one for the same container is stored with body null
+("same page again"), which keeps a whole shift of refreshes small.
+
+    DHR_RECORD_ARCHIVE=shift.jsonl.gz python reporting_app.py         # record
+    DHR_FETCH_ENGINE=replay DHR_REPLAY_ARCHIVE=shift.jsonl.gz \\
+        DHR_REPLAY_SPEED=10 python reporting_app.py                    # replay 10x
+
+    python snapshot_archive.py shift.jsonl.gz                          # summary
+    python snapshot_archive.py shift.jsonl.gz --parse                  # extract+organize timings
+"""
+import argparse
+import gzip
+import json
+import threading
+import time
+from collections import namedtuple
+
+# Fast enough for the fetch thread on multi-MB pages, still ~10x smaller
+COMPRESS_LEVEL = 5
+
+Snapshot = namedtuple("Snapshot", ("t", "container", "format", "body"))
+
+# ================= WRITER =================
+
+class ArchiveWriter:
+    """Appends fetched pages to an archive; one instance can be shared by all monitor threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = 0
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+
+    def record(self, container, render_format, body, t=None):
+        """Appends one fetch; body=None records an unchanged page."""
+        line = json.dumps({
+            "t": time.time() if t is None else t,
+            "container": container,
+            "format": render_format,
+            "body": body,
+        }) + "\n"
+        member = gzip.compress(line.encode("utf-8"), COMPRESS_LEVEL)
+        with self._lock:
+            self._file.write(member)
+            self._file.flush()
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+# ================= READER =================
+
+def iter_archive(path):
+    """
+    Snapshots in recorded order, with unchanged fetches (body null) resolved
+    to the container's previous page. A truncated last record is ignored.
+    """
+    last_body = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                record = json.loads(line)
+                container = record["container"]
+                body = record["body"]
+                if body is None:
+                    body = last_body.get(container)
+                    if body is None:
+                        continue
+                else:
+                    last_body[container] = body
+                yield Snapshot(record["t"], container, record["format"], body)
+        except EOFError:
+            # Killed mid-write: everything up to the last complete member is valid
+            return
+
+
+def summarize(path):
+    """{records, containers: {name: count}, start, end} of an archive."""
+    containers = {}
+    start = end = None
+    for snap in iter_archive(path):
+        containers[snap.container] = containers.get(snap.container, 0) + 1
+        start = snap.t if start is None else start
+        end = snap.t
+    return {"records": sum(containers.values()), "containers": containers, "start": start, "end": end}
+
+# ================= CLI =================
+
+def parse_all(path):
+    """Runs every snapshot through the app's change detection, extract() and organize()."""
+    # The app (and PyQt5) are only needed for this mode
+    from reporting_app import METRICS, ChangeDetector, parse_report
+
+    detectors = {}
+    for snap in iter_archive(path):
+        changes = detectors.setdefault(snap.container, ChangeDetector(container=snap.container))
+        if not changes.changed_html(snap.body, snap.format):
+            continue
+        with METRICS.stage("parse+organize"):
+            rows, organized = parse_report(snap.body, snap.format)
+        changes.process_parsed(rows, organized)
+    for container, changes in sorted(detectors.items()):
+        print(f"  {container}: {changes.summary()}")
+    print(METRICS.to_table())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or profile a recorded snapshot archive.")
+    parser.add_argument("archive")
+    parser.add_argument("--parse", action="store_true", help="time extract+organize over every snapshot")
+    args = parser.parse_args()
+
+    info = summarize(args.archive)
+    if not info["records"]:
+        print("Archive is empty.")
+    else:
+        span = info["end"] - info["start"]
+        print(f"{info['records']} fetches over {span / 60:.1f} min, "
+              f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info['start']))} onwards")
+        for container, count in sorted(info["containers"].items()):
+            print(f"  {container}: {count}")
+    if args.parse:
+        parse_all(args.archive)
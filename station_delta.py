@@ -0,0 +1,100 @@
+"""
+Per-station change protocol between the monitor threads and the GUI.
+
+A station view is {shift: {station: (employee, frozenset of passed tasks)}}.
+Instead of the whole organized report, the thread sends the typed changes
+between its previous view and the new one, and the GUI applies them to its
+own copy. Payload and GUI work follow what changed, not the report size.
+
+Changes are computed and sent from one thread per container, in batches
+numbered 1, 2, ... A receiver that sees a gap (a batch lost or delivered
+out of order) asks the sender for snapshot() and replaces its copy.
+
+    tracker = StationTracker()
+    batch = tracker.update(views)         # thread: None if no station changed
+    touched = apply_changes(gui_views, batch.changes)   # GUI: {(shift, station)}
+"""
+import threading
+from collections import namedtuple
+
+# Change kinds (StationChange.kind) and their value
+EMPLOYEE = "employee"           # employee now shown ("" = nobody)
+TASK_PASSED = "task_passed"     # task name, now passed
+TASK_CLEARED = "task_cleared"   # task name, no longer passed (e.g. a new day's report)
+IDLE = "idle"                   # station no longer in the report; value None
+
+StationChange = namedtuple("StationChange", ("shift", "station", "kind", "value"))
+
+# One send: seq numbers the batches of a tracker; full means changes rebuild
+# the whole view from empty (a resync) instead of following batch seq - 1
+StationBatch = namedtuple("StationBatch", ("seq", "full", "changes"))
+
+# State of a station missing from a view
+IDLE_STATE = ("", frozenset())
+
+# ================= DIFF =================
+
+def diff_views(old, new):
+    """Changes that turn view old into view new, in shift/station order."""
+    changes = []
+    for shift in sorted(old.keys() | new.keys()):
+        before, after = old.get(shift, {}), new.get(shift, {})
+        for station in sorted(before.keys() | after.keys()):
+            if station not in after:
+                changes.append(StationChange(shift, station, IDLE, None))
+                continue
+            old_employee, old_tasks = before.get(station, IDLE_STATE)
+            employee, tasks = after[station]
+            if employee != old_employee:
+                changes.append(StationChange(shift, station, EMPLOYEE, employee))
+            if tasks != old_tasks:
+                changes.extend(StationChange(shift, station, TASK_PASSED, t) for t in sorted(tasks - old_tasks))
+                changes.extend(StationChange(shift, station, TASK_CLEARED, t) for t in sorted(old_tasks - tasks))
+    return changes
+
+
+def apply_changes(views, changes):
+    """Applies changes to views in place; returns the (shift, station) pairs touched."""
+    touched = set()
+    for shift, station, kind, value in changes:
+        stations = views.setdefault(shift, {})
+        touched.add((shift, station))
+        if kind == IDLE:
+            stations.pop(station, None)
+            continue
+        employee, tasks = stations.get(station, IDLE_STATE)
+        if kind == EMPLOYEE:
+            employee = value
+        elif kind == TASK_PASSED:
+            tasks = tasks | {value}
+        elif kind == TASK_CLEARED:
+            tasks = tasks - {value}
+        else:
+            raise ValueError(f"Unknown station change {kind!r}")
+        stations[station] = (employee, tasks)
+    return touched
+
+
+class StationTracker:
+    """Last view sent for one container; update() turns the next one into a numbered batch."""
+
+    def __init__(self):
+        self.views = {}
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def update(self, views):
+        """Batch of the changes from the last view sent, or None if no station changed."""
+        with self._lock:
+            changes = diff_views(self.views, views)
+            self.views = views
+            if not changes:
+                return None
+            self.seq += 1
+            # The first batch is diffed from an empty view, i.e. it is the whole view
+            return StationBatch(self.seq, self.seq == 1, changes)
+
+    def snapshot(self):
+        """Full batch of the last view sent, as of batch seq (for a receiver's resync)."""
+        with self._lock:
+            return StationBatch(self.seq, True, diff_views({}, self.views))
@@ -0,0 +1,143 @@
+"""
+Synthetic SSRS ReportViewer pages for benchmarks and offline runs.
+
+The output has the shape extract() expects from the live DHR report: a heavy
+page preamble (scripts, __VIEWSTATE, toolbar tables), then the oReportDiv
+wrapper holding one table whose task-list and employee cells are rowspan'd
+over each group, with task item / status / timestamp cells per row and
+FAIL -> PASS retry pairs. Deterministic for a given seed.
+
+    python synthetic_report.py 100000 big_report.html
+
+make_report_pages() splits the same report into SSRS-style pages, breaking
+mid-group without repeating the header or the rowspan'd cells.
+"""
+import random
+import sys
+
+# Real task lists first so the GUI has stations to draw; the rest are filler
+TASK_LISTS = [
+    "DA-1181_MQI-24751", "MQI-24747_03", "MQI-24748_03", "MQI-24749_04",
+    "MQI-24750_03", "MQI-24752_04", "MQI-24753_03", "MQI-24803_03",
+    "MQI-2565_QC_Insp_05",
+] + [f"MQI-{30000 + i}_{i % 7:02d}" for i in range(200)]
+
+TASK_ITEMS = [
+    "Workstation Setup", "Equipment Setup", "Issue Floor Stock",
+    "Material Verification", "Verify Open Documents", "Verify LHC and Docs",
+    "Perform Process",
+]
+
+FIRST_TS = 6 * 3600           # 6:00 AM
+LAST_TS = 23 * 3600 + 59 * 60  # 11:59 PM
+
+# ================= HELPERS =================
+
+def _timestamp(date, seconds):
+    hour, rem = divmod(seconds, 3600)
+    minute, second = divmod(rem, 60)
+    return f"{date} {(hour - 1) % 12 + 1}:{minute:02d}:{second:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def _row(cells):
+    return "<tr>" + "".join(cells) + "</tr>"
+
+
+def _cell(text, rowspan=1):
+    span = f' rowspan="{rowspan}"' if rowspan > 1 else ""
+    return f'<td{span} class="a7"><div class="r9">{text}</div></td>'
+
+
+def _preamble(size_kb):
+    return "".join([
+        "<!DOCTYPE html><html><head><title>DHR Report - Mfg</title>",
+        '<script type="text/javascript">',
+        "Sys.Application.add_init(function() { $create(Microsoft.Reporting.WebFormsClient.ReportViewer); });\n"
+        * (size_kb * 4),
+        "</script></head><body><form method=\"post\" id=\"form1\">",
+        '<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="',
+        "dDwtMTI4NzU" * (size_kb * 40),
+        '" /><div id="ReportViewerControl_ctl05"><table class="ToolbarTable">',
+        "<tr><td><input type=\"image\" title=\"Refresh\" /></td><td>1 of 1</td></tr>" * 40,
+        "</table></div>",
+        '<div id="ReportViewerControl_ctl09" style="height:100%">',
+        '<div id="ReportViewerControl_ctl09_ReportArea">',
+    ])
+
+# ================= GENERATOR =================
+
+REPORT_OPEN = '<div id="ctl31_ctl09_oReportDiv"><div class="r1">DHR Report</div><table cellspacing="0">'
+REPORT_CLOSE = "</table></div></div></div></form></body></html>"
+
+
+def _header():
+    return _row([_cell(h) for h in ("Task List", "Employee", "Task Item", "Status", "Txn Date")])
+
+
+def _iter_groups(n_rows, seed, date):
+    """Yields the <tr> strings of one rowspan group at a time."""
+    rnd = random.Random(seed)
+    step = (LAST_TS - FIRST_TS) / max(n_rows, 1)
+    written = 0
+    group = 0
+    while written < n_rows:
+        # Each group: one task list + one employee, a run of task items, some FAIL -> PASS retries
+        items = []
+        for item in rnd.sample(TASK_ITEMS, rnd.randint(2, len(TASK_ITEMS))):
+            if rnd.random() < 0.08:
+                items.append((item, "FAIL"))
+            items.append((item, "PASS"))
+        items = items[:n_rows - written]
+
+        task_list = TASK_LISTS[group % len(TASK_LISTS)]
+        employee = f"{rnd.choice('abcdefghjkmnprstw')}{rnd.choice(['smith', 'nguyen', 'garcia', 'lee', 'khan'])}{group % 50}"
+        out = []
+        for i, (item, status) in enumerate(items):
+            ts = _timestamp(date, int(FIRST_TS + (written + i) * step))
+            cells = []
+            if i == 0:
+                cells.append(_cell(task_list, len(items)))
+                cells.append(_cell(employee, len(items)))
+            cells.extend([_cell(item), _cell(status), _cell(ts)])
+            out.append(_row(cells))
+        yield out
+        written += len(items)
+        group += 1
+
+
+def iter_report_html(n_rows, seed=0, date="12/16/2025", preamble_kb=200):
+    """Yields the page in chunks (one rowspan group at a time) so 1M-row pages can be streamed to disk."""
+    yield _preamble(preamble_kb)
+    yield REPORT_OPEN
+    yield _header()
+    for group in _iter_groups(n_rows, seed, date):
+        yield "".join(group)
+    yield REPORT_CLOSE
+
+
+def make_report_pages(n_rows, pages, seed=0, date="12/16/2025", preamble_kb=200):
+    """The report of make_report_html() as a list of page HTMLs (header on page 1 only)."""
+    rows = [row for group in _iter_groups(n_rows, seed, date) for row in group]
+    per_page = -(-len(rows) // pages)
+    return [
+        "".join([_preamble(preamble_kb), REPORT_OPEN, _header() if page == 0 else "",
+                 *rows[page * per_page:(page + 1) * per_page], REPORT_CLOSE])
+        for page in range(pages)
+    ]
+
+
+def make_report_html(n_rows, seed=0, **kwargs):
+    return "".join(iter_report_html(n_rows, seed, **kwargs))
+
+
+def write_report(path, n_rows, seed=0, **kwargs):
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in iter_report_html(n_rows, seed, **kwargs):
+            f.write(chunk)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python synthetic_report.py N_ROWS OUTPUT.html")
+    write_report(sys.argv[2], int(sys.argv[1]))
+    print(f"Wrote {sys.argv[1]} rows to {sys.argv[2]}")